@@ -1,32 +1,23 @@
-import matplotlib.pyplot as plt
-import networkx as nx
+import heapq
 
 def read_file(file_name: str) -> list[str]:
     with open(file_name, 'r', encoding='utf-8') as file:
         file_con = file.readlines()
     return file_con
 
-def visualize_graph(vertical_out: dict, output_file="graph.png"):
+def visualize_graph(vertical_out: dict, output_file="graph.png", page_rank=None,
+                    top=50, hosts=False):
     """
-    Візуалізує використовуючи networkx + matplotlib.
+    Візуалізує топ-top підграф (або граф хостів) через graph_view.
+
+    Розмір і колір вершин залежать від PageRank, розкладка кешується у
+    graph_layout.json, а для .dot/.svg не потрібно растеризувати
+    величезний PNG. matplotlib і networkx імпортуються лише там, де
+    вони потрібні, тож PageRank з цього файлу працює і без них.
     """
-    G = nx.DiGraph()
-    for start, ends in vertical_out.items():
-        for end in ends:
-            G.add_edge(start, end)
-    plt.figure(figsize=(8, 6))
-    pos = nx.spring_layout(G, seed=42) 
-    nx.draw(
-        G, pos,
-        with_labels=True,
-        node_size=2000,
-        node_color="#87CEFA",
-        arrowsize=20,
-        font_size=10,
-        font_weight="bold"
-    )
-    plt.savefig(output_file, dpi=300, bbox_inches="tight")
-    plt.close()
+    from graph_view import render_graph
+
+    return render_graph(vertical_out, output_file, page_rank, top, hosts)
     
 def create_dictionaries(file_content: list[str]) -> tuple:
     vertical_out = {}
@@ -84,20 +75,18 @@ def get_page_rank(page_rank, out_in_ribs, in_out_ribs, peaks, useless_peaks):
     return page_rank
 
 def top_k(page_rank: dict, k: int = 5) -> list[tuple]:
-    """Return top-k vertices by PageRank."""
-    return sorted(page_rank.items(), key=lambda x: -x[1])[:k]
+    """Return top-k vertices by PageRank (bounded heap, no full sort)."""
+    return heapq.nlargest(k, page_rank.items(), key=lambda x: x[1])
 
 if __name__ == '__main__':
     file_c = read_file('graph_in.dot')
     vertical_in_1, vertical_out_1, pagerank, vertex, not_used_vertex = create_dictionaries(file_c)
-    visualize_graph(vertical_out_1, "graph.png")
-    
     final_pr = get_page_rank(pagerank, vertical_out_1, vertical_in_1, vertex, not_used_vertex)
+    visualize_graph(vertical_out_1, "graph.png", final_pr)
     
     print("All PageRank values:")
     print(final_pr)
     
     print("\nTop 5 vertices:")
     for vertex, rank in top_k(final_pr, 5):
-        print(f"{vertex}: {rank:.6f}")   
-\
+        print(f"{vertex}: {rank:.6f}")
@@ -0,0 +1,107 @@
+"""Мікробенчмарк витягування посилань з великих HTML-сторінок"""
+
+import random
+import re
+import sys
+import time
+from urllib.parse import urljoin, urldefrag
+
+from link_extractor import LinkExtractor
+
+HREF_PATTERN = r'href\s*=\s*["\']([^"\']+)["\']'
+BASE_URL = "https://example.com/section/index.html"
+
+
+def make_html(num_links: int, seed: int = 0) -> str:
+    """
+    Генерує синтетичну HTML-сторінку з різними типами посилань.
+
+    Серед посилань є відносні та абсолютні адреси, повтори, фрагменти,
+    mailto:/javascript:, таблиці стилів, скрипти та зображення.
+
+    :param num_links: int, кількість посилань на сторінці.
+    :param seed: int, зерно генератора випадкових чисел.
+    :return: str, текст HTML.
+    """
+    rnd = random.Random(seed)
+    kinds = [
+        lambda i: f"/articles/{i}",
+        lambda i: f"page-{i}.html#part{i % 7}",
+        lambda i: f"https://site{i % 50}.org/path/{i}?q={i}",
+        lambda i: f"/static/style{i % 10}.css",
+        lambda i: f"/static/app{i % 10}.js",
+        lambda i: f"/img/photo{i}.jpg",
+        lambda i: "mailto:info@example.com",
+        lambda i: "javascript:void(0)",
+        lambda i: f"/articles/{i % 100}",
+    ]
+    parts = ["<html><head><title>bench</title></head><body>"]
+    for i in range(num_links):
+        href = rnd.choice(kinds)(i)
+        parts.append(f'<div class="item"><p>Lorem ipsum dolor sit amet {i}</p>'
+                     f'<a class="link" href="{href}">link {i}</a></div>\n')
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def legacy_extract(url: str, html: str) -> list[str]:
+    """
+    Попередній спосіб витягування посилань (ланцюжок перевірок підрядків).
+
+    :param url: str, адреса сторінки.
+    :param html: str, вміст сторінки.
+    :return: list[str], знайдені посилання (з повторами).
+    """
+    links = []
+    for match in re.finditer(HREF_PATTERN, html, flags=re.IGNORECASE):
+        href = match.group(1).strip()
+        if (href.startswith("mailto:") or
+                href.startswith("javascript:") or
+                'css' in href or
+                'json' in href or
+                '.ico' in href or
+                '.svg' in href or
+                '.js' in href or
+                'creativecommons' in href or
+                'png' in href or
+                'jpg' in href):
+            continue
+        full_url, _ = urldefrag(urljoin(url, href))
+        if not (full_url.startswith("http://") or full_url.startswith("https://")):
+            continue
+        links.append(full_url)
+    return links
+
+
+def measure(name: str, func, html: str, repeats: int):
+    """
+    Вимірює швидкість функції витягування посилань і друкує результат.
+
+    :param name: str, назва варіанту.
+    :param func: callable, функція (url, html) -> list[str].
+    :param html: str, сторінка для обробки.
+    :param repeats: int, кількість повторів.
+    """
+    hrefs = len(re.findall(HREF_PATTERN, html, flags=re.IGNORECASE))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        links = func(BASE_URL, html)
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{name:<10} {len(links):>8} посилань  {elapsed * 1000:9.2f} мс  "
+          f"{hrefs / elapsed:12.0f} href/с")
+
+
+def main():
+    """Запускає бенчмарк на сторінках різного розміру."""
+    extractor = LinkExtractor()
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for size in sizes:
+        html = make_html(size)
+        repeats = max(1, 200_000 // size)
+        print(f"Сторінка з {size} посиланнями ({len(html) // 1024} КБ):")
+        measure("legacy", legacy_extract, html, repeats)
+        measure("extractor", extractor.extract, html, repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Бенчмарк зчитування графа, побудови структур та збіжності PageRank"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import graph_io
+import instrumentation
+import pagerank_engine
+from pagerank_solvers import solve_page_rank
+from pipeline import create_dictionaries, get_page_rank, read_file
+from ranking import top_k_indices, top_k_items
+
+
+SOLVER_VARIANTS = [("jacobi", 0), ("jacobi", 10), ("gauss_seidel", 0), ("adaptive", 0)]
+
+
+def generate_graph(num_vertexes: int, seed: int = 0, avg_degree: float = 8.0,
+                   dangling_share: float = 0.1, isolated_share: float = 0.02):
+    """
+    Генерує синтетичний граф, схожий на граф посилань у вебі.
+
+    Кількість вихідних посилань має степеневий розподіл (Парето),
+    популярні сторінки (з меншими номерами) отримують більше вхідних
+    посилань, частина вершин "висяча" (без вихідних ребер), а частина
+    ізольована (без жодних ребер).
+
+    :param num_vertexes: int, кількість вершин.
+    :param seed: int, зерно генератора випадкових чисел.
+    :param avg_degree: float, приблизний середній вихідний степінь.
+    :param dangling_share: float, частка вершин без вихідних ребер.
+    :param isolated_share: float, частка ізольованих вершин.
+    :return: tuple[list[tuple[int, int]], set[int]], список ребер та
+        множина ізольованих вершин.
+    """
+    rnd = random.Random(seed)
+    isolated = set(rnd.sample(range(num_vertexes), int(num_vertexes * isolated_share)))
+    connected = [v for v in range(num_vertexes) if v not in isolated]
+    alpha = 2.5
+    scale = avg_degree * (alpha - 1) / alpha
+    edges = []
+    for src in connected:
+        if rnd.random() < dangling_share:
+            continue
+        degree = min(int(scale * rnd.paretovariate(alpha)) + 1, 1000)
+        for _ in range(degree):
+            dst = connected[int(len(connected) * rnd.random() ** 3)]
+            if dst != src:
+                edges.append((src, dst))
+    return edges, isolated
+
+
+def url_of(vertex: int) -> str:
+    """
+    Повертає URL синтетичної вершини (кілька сотень "сайтів").
+
+    :param vertex: int, номер вершини.
+    :return: str, URL вершини.
+    """
+    return f"https://site{vertex % 997}.example.com/page/{vertex}"
+
+
+def write_edge_file(file_name: str, edges):
+    """
+    Записує ребра у текстовий файл у форматі "src -> dst".
+
+    :param file_name: str, шлях до файлу.
+    :param edges: list[tuple[int, int]], ребра графа.
+    """
+    with open(file_name, "w", encoding="utf-8") as file:
+        for src, dst in edges:
+            file.write(f"{url_of(src)} -> {url_of(dst)}\n")
+
+
+def measure(func, *args, memory: bool = True, **kwargs) -> tuple:
+    """
+    Вимірює час виконання функції та (окремим запуском) пікову пам'ять.
+
+    Час міряється без tracemalloc, бо він сповільнює Python-код;
+    пікова пам'ять – другим запуском під tracemalloc.
+
+    :param func: callable, функція для вимірювання.
+    :param args: аргументи функції.
+    :param memory: bool, чи вимірювати пікову пам'ять.
+    :param kwargs: іменовані аргументи функції.
+    :return: tuple[object, float, int | None], результат функції,
+        час у секундах та пік виділеної пам'яті в байтах.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def dict_engine(graph: tuple) -> tuple:
+    """
+    Запускає get_page_rank на копії початкового словника.
+
+    Кількість ітерацій береться з лічильника rank.iterations модуля
+    instrumentation (різниця до і після запуску, тож уже зібрані
+    значення не губляться).
+
+    :param graph: tuple, результат create_dictionaries.
+    :return: tuple[dict, int], PageRank та кількість ітерацій.
+    """
+    vertical_in, vertical_out, page_rank, vertexes, not_used = graph
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.enable(reset=False)
+    before = instrumentation.summary()["counters"].get("rank.iterations", 0)
+    try:
+        result = get_page_rank(dict(page_rank), vertical_out, vertical_in, vertexes, not_used)
+    finally:
+        if not was_enabled:
+            instrumentation.disable()
+    iterations = instrumentation.summary()["counters"].get("rank.iterations", 0) - before
+    return result, iterations
+
+
+def sparse_engine(matrix_and_dangling: tuple) -> tuple:
+    """
+    Запускає степеневий метод на вже побудованій матриці переходів.
+
+    :param matrix_and_dangling: tuple, матриця переходів і маска "висячих" вершин.
+    :return: tuple[numpy.ndarray, int], вектор PageRank та кількість ітерацій.
+    """
+    return pagerank_engine.power_iteration(*matrix_and_dangling)
+
+
+def top_k_sorted(page_rank: dict, k: int) -> list[tuple]:
+    """
+    Повертає k найкращих вершин повним сортуванням (як top_k у base_script.py).
+
+    :param page_rank: dict[str, float], словник PageRank.
+    :param k: int, кількість вершин.
+    :return: list[tuple[str, float]], k пар (URL, PageRank).
+    """
+    return sorted(page_rank.items(), key=lambda x: -x[1])[:k]
+
+
+def run_size(num_vertexes: int, engines: list[str], seed: int, memory: bool,
+             max_dict_size: int, workdir: str) -> list[dict]:
+    """
+    Виконує всі етапи бенчмарку для графа одного розміру.
+
+    :param num_vertexes: int, кількість вершин.
+    :param engines: list[str], рушії PageRank для порівняння.
+    :param seed: int, зерно генератора.
+    :param memory: bool, чи вимірювати пікову пам'ять.
+    :param max_dict_size: int, найбільший граф для повільного рушія "dict".
+    :param workdir: str, тека для тимчасових файлів.
+    :return: list[dict], записи з результатами.
+
+    Ізольовані вершини не можна записати у файл ребер, тому вони
+    додаються до словників після зчитування; рушій "binary" працює
+    лише з файлом і їх не бачить.
+    """
+    edges, isolated = generate_graph(num_vertexes, seed)
+    dot_name = os.path.join(workdir, f"graph_{num_vertexes}.dot")
+    binary_name = os.path.join(workdir, f"graph_{num_vertexes}.bin")
+    write_edge_file(dot_name, edges)
+    results = []
+
+    def record(stage: str, engine: str | None, seconds: float, peak, iterations=None):
+        results.append({"vertexes": num_vertexes, "edges": len(edges), "stage": stage,
+                        "engine": engine, "seconds": round(seconds, 6),
+                        "iterations": iterations, "peak_bytes": peak})
+        print(f"{num_vertexes:>9} {stage:<14} {engine or '':<14} {seconds:10.4f} с"
+              f"  ітерацій: {iterations if iterations is not None else '-':>4}"
+              f"  пам'ять: {peak / 2 ** 20 if peak else 0:9.1f} МБ")
+
+    def parse_legacy():
+        return create_dictionaries(read_file(dot_name))
+
+    graph, seconds, peak = measure(parse_legacy, memory=memory)
+    record("parse_readlines", None, seconds, peak)
+    graph, seconds, peak = measure(graph_io.read_graph, dot_name, memory=memory)
+    record("parse_stream", None, seconds, peak)
+    isolated_urls = {url_of(v) for v in isolated}
+    graph[3].update(isolated_urls)
+    graph = graph[:2] + (dict.fromkeys(sorted(graph[3]), 1 / len(graph[3])),) + graph[3:]
+
+    if "dict" in engines and num_vertexes <= max_dict_size:
+        (_, iterations), seconds, peak = measure(dict_engine, graph, memory=memory)
+        record("rank", "dict", seconds, peak, iterations)
+    if "sparse" in engines:
+        def build_sparse():
+            _, index = pagerank_engine.intern_vertexes(graph[3])
+            return pagerank_engine.build_transition_matrix(graph[1], index)
+        built, seconds, peak = measure(build_sparse, memory=memory)
+        record("build", "sparse", seconds, peak)
+        (rank, iterations), seconds, peak = measure(sparse_engine, built, memory=memory)
+        record("rank", "sparse", seconds, peak, iterations)
+        urls = sorted(graph[3])
+        scores = dict(zip(urls, rank.tolist()))
+        _, seconds, peak = measure(top_k_sorted, scores, 10, memory=memory)
+        record("top_k", "sorted", seconds, peak)
+        _, seconds, peak = measure(top_k_items, scores, 10, memory=memory)
+        record("top_k", "heap", seconds, peak)
+        _, seconds, peak = measure(top_k_indices, rank, 10, memory=memory)
+        record("top_k", "vector", seconds, peak)
+        for solver, extrapolate_every in SOLVER_VARIANTS:
+            name = solver if not extrapolate_every else f"{solver}+qe"
+            (_, report), seconds, peak = measure(solve_page_rank, *built, solver, None,
+                                                 extrapolate_every=extrapolate_every,
+                                                 memory=memory)
+            record("solve", name, seconds, peak, report["iterations"])
+    if "binary" in engines:
+        _, seconds, peak = measure(graph_io.convert_edge_file, dot_name, binary_name,
+                                   memory=memory)
+        record("convert", "binary", seconds, peak)
+        binary_graph, seconds, peak = measure(graph_io.BinaryGraph, binary_name, memory=False)
+        record("open_mmap", "binary", seconds, peak)
+
+        def build_binary():
+            return pagerank_engine.transition_matrix_from_csr(binary_graph.row_offsets,
+                                                              binary_graph.targets)
+        built, seconds, peak = measure(build_binary, memory=memory)
+        record("build", "binary", seconds, peak)
+        (_, iterations), seconds, peak = measure(sparse_engine, built, memory=memory)
+        record("rank", "binary", seconds, peak, iterations)
+        del built
+        binary_graph.close()
+    return results
+
+
+def git_commit() -> str | None:
+    """
+    Повертає хеш поточного коміту, щоб порівнювати запуски між комітами.
+
+    :return: str | None, хеш коміту або None, якщо git недоступний.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Розбирає аргументи командного рядка та запускає бенчмарк."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="кількості вершин (до 1000000)")
+    parser.add_argument("--engines", nargs="+", default=["dict", "sparse", "binary"],
+                        choices=["dict", "sparse", "binary"])
+    parser.add_argument("--max-dict-size", type=int, default=100_000,
+                        help="найбільший граф для рушія dict")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="не вимірювати пікову пам'ять (удвічі швидше)")
+    parser.add_argument("--output", default="bench_pagerank.json",
+                        help="файл для результатів у форматі JSON")
+    args = parser.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            results.extend(run_size(size, args.engines, args.seed, not args.no_memory,
+                                    args.max_dict_size, workdir))
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"Результати записано у {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Бенчмарк прискорення розподіленого PageRank залежно від кількості процесів"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+
+import pagerank_engine
+from bench_pagerank import generate_graph, git_commit
+from sharded_pagerank import sharded_power_iteration
+
+
+def build_matrix(num_vertexes: int, seed: int) -> tuple:
+    """
+    Будує матрицю переходів синтетичного графа напряму з номерів вершин.
+
+    :param num_vertexes: int, кількість вершин.
+    :param seed: int, зерно генератора.
+    :return: tuple[scipy.sparse.csr_matrix, numpy.ndarray, int], матриця
+        переходів, маска "висячих" вершин та кількість ребер.
+    """
+    edges, _ = generate_graph(num_vertexes, seed)
+    pairs = np.unique(np.array(edges, dtype=np.int64), axis=0)
+    sources, targets = pairs[:, 0], pairs[:, 1]
+    out_degree = np.bincount(sources, minlength=num_vertexes).astype(np.float64)
+    matrix = sparse.csr_matrix((1.0 / out_degree[sources], (targets, sources)),
+                               shape=(num_vertexes, num_vertexes))
+    return matrix, out_degree == 0, len(pairs)
+
+
+def main():
+    """Розбирає аргументи командного рядка та запускає бенчмарк."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000, help="кількість вершин")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+                        help="кількості процесів для порівняння")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_sharded.json",
+                        help="файл для результатів у форматі JSON")
+    args = parser.parse_args()
+    print(f"Генерація графа з {args.size} вершинами...")
+    matrix, dangling, num_edges = build_matrix(args.size, args.seed)
+    start = time.perf_counter()
+    _, iterations = pagerank_engine.power_iteration(matrix, dangling)
+    baseline = time.perf_counter() - start
+    print(f"один процес (power_iteration): {baseline:8.3f} с, ітерацій: {iterations}")
+    results = [{"workers": 0, "seconds": round(baseline, 6), "iterations": iterations,
+                "speedup": 1.0}]
+    for workers in args.workers:
+        start = time.perf_counter()
+        _, iterations = sharded_power_iteration(matrix, dangling, workers=workers)
+        seconds = time.perf_counter() - start
+        print(f"процесів: {workers:>3}  {seconds:8.3f} с  ітерацій: {iterations}  "
+              f"прискорення: {baseline / seconds:5.2f}x")
+        results.append({"workers": workers, "seconds": round(seconds, 6),
+                        "iterations": iterations, "speedup": round(baseline / seconds, 3)})
+    report = {"commit": git_commit(), "vertexes": args.size, "edges": num_edges,
+              "cpu_count": os.cpu_count(), "results": results}
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"Результати записано у {args.output}")
+
+
+if __name__ == "__main__":
+    main()
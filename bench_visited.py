@@ -0,0 +1,98 @@
+"""Бенчмарк сховищ відвіданих сторінок: пам'ять і швидкість"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench_pagerank import git_commit
+from visited_store import VISITED_STORES, make_visited_store, remove_visited_store
+
+
+def make_url(number: int) -> str:
+    """
+    Генерує реалістичний URL з номером number (кілька сотень хостів).
+
+    :param number: int, номер URL.
+    :return: str, URL.
+    """
+    return (f"https://site{number % 317}.example.org/articles/{number // 7}/"
+            f"page-{number}.html?ref=nav{number % 13}")
+
+
+def measure_store(kind: str, size: int, path: str) -> dict:
+    """
+    Вимірює сховище: швидкість додавання нових і повторних URL та пам'ять.
+
+    Швидкість вимірюється без tracemalloc (він сильно сповільнює
+    виділення пам'яті). Пам'ять рахується окремим проходом через
+    tracemalloc: URL створюються всередині проходу, тож для "exact"
+    враховуються й самі рядки, як у справжньому обході. Для "disk"
+    окремо вказується розмір файлу SQLite.
+
+    :param kind: str, назва сховища з VISITED_STORES.
+    :param size: int, кількість URL.
+    :param path: str, файл SQLite для "disk".
+    :return: dict, результати вимірювання.
+    """
+    urls = [make_url(number) for number in range(size)]
+    remove_visited_store(path)
+    store = make_visited_store(kind, path)
+    start = time.perf_counter()
+    for url in urls:
+        store.add(url)
+    add_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    repeated = sum(not store.add(url) for url in urls)
+    repeat_seconds = time.perf_counter() - start
+    store.close()
+    disk = os.path.getsize(path) if kind == "disk" else 0
+    remove_visited_store(path)
+    assert repeated == size
+    del urls
+    tracemalloc.start()
+    store = make_visited_store(kind, path)
+    for number in range(size):
+        store.add(make_url(number))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    store.close()
+    remove_visited_store(path)
+    return {"store": kind, "urls": size,
+            "add_per_sec": round(size / add_seconds),
+            "lookup_per_sec": round(size / repeat_seconds),
+            "memory_bytes": memory, "bytes_per_url": round(memory / size, 1),
+            "disk_bytes": disk}
+
+
+def main():
+    """Розбирає аргументи командного рядка та запускає бенчмарк."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="кількості URL")
+    parser.add_argument("--stores", nargs="+", choices=VISITED_STORES,
+                        default=list(VISITED_STORES))
+    parser.add_argument("--output", default="bench_visited.json",
+                        help="файл для результатів у форматі JSON")
+    args = parser.parse_args()
+    path = os.path.join(tempfile.gettempdir(), "bench_visited.sqlite")
+    results = []
+    for size in args.sizes:
+        print(f"{size} URL:")
+        for kind in args.stores:
+            result = measure_store(kind, size, path)
+            results.append(result)
+            print(f"  {kind:<12} {result['add_per_sec']:>10} дод./с  "
+                  f"{result['lookup_per_sec']:>10} перев./с  "
+                  f"{result['bytes_per_url']:>7} Б/URL у пам'яті  "
+                  f"{result['disk_bytes'] / size:6.1f} Б/URL на диску")
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"commit": git_commit(), "results": results}, file,
+                  ensure_ascii=False, indent=2)
+    print(f"Результати записано у {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Командний рядок без GUI: обхід, PageRank, топ-k і конвертація графа
+
+Приклади:
+    python cli.py crawl https://example.com --depth 2 -o menu.dot
+    python cli.py rank menu.dot --engine sparse -o ranks.tsv
+    python cli.py top-k ranks.tsv -k 20
+    python cli.py convert menu.dot menu.bin
+    python cli.py draw menu.dot --top 50 -o graph.svg
+    python cli.py --stats stats.json rank menu.bin
+
+Модулі імпортуються лише в тих командах, яким вони потрібні: PyQt5,
+matplotlib і networkx не завантажуються взагалі, а NumPy/SciPy – лише
+для бінарних графів та матричних рушіїв.
+"""
+
+import argparse
+import heapq
+import sys
+
+from instrumentation import collect
+
+RANK_ENGINES = ("dict", "sparse", "sharded", "jacobi", "gauss_seidel", "adaptive",
+                "blockrank")
+
+
+def print_top(items):
+    """
+    Друкує пари (URL, PageRank) у тому ж вигляді, що й GUI.
+
+    :param items: iterable[tuple[str, float]], пари за спаданням PageRank.
+    """
+    for url, pr in items:
+        print(f"{pr:.6f}  {url}")
+
+
+def is_binary_graph(file_name: str) -> bool:
+    """
+    Перевіряє, чи файл записано у бінарному форматі graph_io.
+
+    :param file_name: str, шлях до файлу графа.
+    :return: bool, True, якщо файл починається з BINARY_MAGIC.
+    """
+    from graph_io import BINARY_MAGIC
+    with open(file_name, "rb") as file:
+        return file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def command_crawl(args):
+    """Обходить сайт і записує ребра графа у файл."""
+    from pipeline import search_links
+    stats = {}
+    completed = search_links(args.url, args.depth, args.output, args.max_links,
+                             workers=args.workers,
+                             cache_path=None if args.no_cache else args.cache,
+                             log=print if args.verbose else None, progress=stats.update,
+                             resume=args.resume, visited_store=args.visited_store,
+                             per_host=args.per_host, delay=args.delay,
+                             checkpoint_interval=args.checkpoint_interval)
+    if stats:
+        print(f"Сторінок: {stats['pages']}, ребер: {stats['edges']}, "
+              f"{stats['pages_per_sec']:.1f} стор./с")
+    print(f"Граф записано у {args.output}" if completed else "Обхід скасовано.")
+
+
+def command_rank(args):
+    """Рахує PageRank графа, друкує топ-k і за бажанням записує всі значення."""
+    if is_binary_graph(args.graph):
+        if args.engine not in ("dict", "sparse"):
+            sys.exit("Для бінарного графа підтримується лише рушій sparse.")
+        from graph_io import BinaryGraph
+        from pagerank_engine import binary_page_rank
+        with BinaryGraph(args.graph) as graph:
+            page_rank = binary_page_rank(graph, None if args.output else args.top)
+    else:
+        from graph_io import read_graph
+        from pipeline import get_rank_engine
+        vertical_in, vertical_out, page_rank, vertexes, not_used = read_graph(args.graph)
+        if not vertexes:
+            sys.exit("У графі немає жодного ребра.")
+        page_rank = get_rank_engine(args.engine, print)(page_rank, vertical_out, vertical_in,
+                                                        vertexes, not_used,
+                                                        sort_result=bool(args.output))
+    from ranking import top_k_items
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            for url, pr in page_rank.items():
+                file.write(f"{url}\t{pr!r}\n")
+        print(f"PageRank {len(page_rank)} сторінок записано у {args.output}")
+    print_top(top_k_items(page_rank, args.top))
+
+
+def command_top_k(args):
+    """Друкує топ-k з файлу значень PageRank (URL<TAB>PageRank), не сортуючи його."""
+    def rows():
+        with open(args.ranks, "r", encoding="utf-8") as file:
+            for line in file:
+                url, _, value = line.rstrip("\n").rpartition("\t")
+                if url:
+                    yield url, float(value)
+    best = heapq.nlargest(args.offset + args.k, rows(), key=lambda row: row[1])
+    print_top(best[args.offset:])
+
+
+def command_convert(args):
+    """Конвертує текстовий граф у бінарний формат graph_io."""
+    from graph_io import convert_edge_file
+    convert_edge_file(args.dot, args.binary)
+    print(f"Граф записано у {args.binary}")
+
+
+def command_draw(args):
+    """Малює топ-k підграф або граф хостів, розфарбований за PageRank."""
+    from graph_io import read_graph
+    from graph_view import render_graph
+    from pipeline import get_rank_engine
+    vertical_in, vertical_out, page_rank, vertexes, not_used = read_graph(args.graph)
+    if not vertexes:
+        sys.exit("У графі немає жодного ребра.")
+    page_rank = get_rank_engine(args.engine, print)(page_rank, vertical_out, vertical_in,
+                                                    vertexes, not_used, sort_result=False)
+    nodes, edges = render_graph(vertical_out, args.output, page_rank, args.top, args.hosts,
+                                None if args.no_layout_cache else args.layout_cache)
+    print(f"{nodes} вершин і {edges} ребер записано у {args.output}")
+
+
+def command_gui(args):
+    """Запускає графічний інтерфейс (PyQt5 імпортується лише тут)."""
+    from ready_project import main as gui_main
+    gui_main()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Створює розбирач аргументів з підкомандами.
+
+    :return: argparse.ArgumentParser, розбирач аргументів.
+    """
+    parser = argparse.ArgumentParser(description="Обхід сайтів і PageRank без GUI.")
+    parser.add_argument("--stats", help="JSON-файл для таймерів і лічильників")
+    parser.add_argument("--profile", help="файл для профілю cProfile")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    crawl = commands.add_parser("crawl", help="обійти сайт і записати граф")
+    crawl.add_argument("url")
+    crawl.add_argument("-o", "--output", default="menu.dot")
+    crawl.add_argument("--depth", type=int, default=2)
+    crawl.add_argument("--max-links", type=int, default=10)
+    crawl.add_argument("--workers", type=int, default=8)
+    crawl.add_argument("--per-host", type=int, default=4)
+    crawl.add_argument("--delay", type=float, default=0.0,
+                       help="мінімальний інтервал між запитами до одного хоста (с)")
+    crawl.add_argument("--visited-store", choices=("exact", "fingerprint", "disk"),
+                       default="fingerprint")
+    crawl.add_argument("--cache", default="fetch_cache.sqlite")
+    crawl.add_argument("--no-cache", action="store_true")
+    crawl.add_argument("--resume", action="store_true")
+    crawl.add_argument("--checkpoint-interval", type=float, default=30.0,
+                       help="мінімальний інтервал між контрольними точками (с)")
+    crawl.add_argument("-v", "--verbose", action="store_true", help="друкувати всі ребра")
+    crawl.set_defaults(handler=command_crawl)
+
+    rank = commands.add_parser("rank", help="порахувати PageRank графа")
+    rank.add_argument("graph", help="текстовий (.dot) або бінарний граф")
+    rank.add_argument("--engine", choices=RANK_ENGINES, default="dict")
+    rank.add_argument("--top", type=int, default=10)
+    rank.add_argument("-o", "--output", help="TSV-файл для всіх значень PageRank")
+    rank.set_defaults(handler=command_rank)
+
+    top_k = commands.add_parser("top-k", help="топ-k з TSV-файлу значень PageRank")
+    top_k.add_argument("ranks")
+    top_k.add_argument("-k", type=int, default=10)
+    top_k.add_argument("--offset", type=int, default=0)
+    top_k.set_defaults(handler=command_top_k)
+
+    convert = commands.add_parser("convert", help="конвертувати граф у бінарний формат")
+    convert.add_argument("dot")
+    convert.add_argument("binary")
+    convert.set_defaults(handler=command_convert)
+
+    draw = commands.add_parser("draw", help="намалювати топ-k підграф або граф хостів")
+    draw.add_argument("graph", help="текстовий (.dot) граф")
+    draw.add_argument("-o", "--output", default="graph.svg",
+                      help="файл .dot/.gv (Graphviz), .svg, .png або .pdf")
+    draw.add_argument("--top", type=int, default=50)
+    draw.add_argument("--hosts", action="store_true", help="граф хостів замість сторінок")
+    draw.add_argument("--engine", choices=RANK_ENGINES, default="dict")
+    draw.add_argument("--layout-cache", default="graph_layout.json")
+    draw.add_argument("--no-layout-cache", action="store_true")
+    draw.set_defaults(handler=command_draw)
+
+    gui = commands.add_parser("gui", help="запустити графічний інтерфейс")
+    gui.set_defaults(handler=command_gui)
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    """
+    Розбирає аргументи командного рядка та виконує підкоманду.
+
+    :param argv: list[str] | None, аргументи (None – sys.argv[1:]).
+    """
+    args = build_parser().parse_args(argv)
+    with collect(args.stats, args.profile):
+        args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
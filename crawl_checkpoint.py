@@ -0,0 +1,106 @@
+"""Контрольні точки обходу: черга, відвідані сторінки та позиція у файлі ребер"""
+
+import glob
+import json
+import os
+import time
+
+CHECKPOINT_VERSION = 3
+SUPPORTED_VERSIONS = (2, 3)
+
+
+def _replace_atomically(path: str, write):
+    """
+    Записує файл через тимчасовий файл і os.replace, щоб збій не лишив його напівзаписаним.
+
+    :param path: str, шлях до файлу.
+    :param write: callable, функція, що записує вміст у відкритий бінарний файл.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def save_checkpoint(path: str, state: dict, visited):
+    """
+    Зберігає стан обходу на диск.
+
+    Відвідані сторінки записуються сховищем (visited.dump) у новий файл
+    path + ".visited.<номер>" для кожного збереження, решта стану – у
+    JSON-файл path, який атомарно замінюється останнім і посилається
+    на цей файл (visited_file). Попередні файли відвіданих видаляються
+    лише після заміни JSON, тож збій у будь-який момент лишає на диску
+    узгоджену пару: або стару, або нову.
+
+    :param path: str, шлях до файлу контрольної точки.
+    :param state: dict, стан обходу: start_url, max_depth,
+        max_links_per_page, depth, frontier, next_frontier, offset,
+        pages, edges.
+    :param visited: visited_store.ExactVisitedStore | FingerprintVisitedStore |
+        DiskVisitedStore, сховище відвіданих сторінок.
+    """
+    visited_path = f"{path}.visited.{time.time_ns()}"
+    _replace_atomically(visited_path, visited.dump)
+    data = dict(state, version=CHECKPOINT_VERSION, visited_store=visited.kind,
+                visited_count=len(visited), visited_file=os.path.basename(visited_path))
+    _replace_atomically(path, lambda file: file.write(
+        json.dumps(data, ensure_ascii=False).encode("utf-8")))
+    for name in _visited_files(path):
+        if name != visited_path:
+            os.remove(name)
+
+
+def _visited_files(path: str) -> list[str]:
+    """
+    Повертає всі файли відвіданих сторінок контрольної точки path.
+
+    :param path: str, шлях до файлу контрольної точки.
+    :return: list[str], шляхи до файлів path + ".visited" і path + ".visited.*".
+    """
+    names = glob.glob(glob.escape(path + ".visited") + ".*")
+    if os.path.exists(path + ".visited"):
+        names.append(path + ".visited")
+    return names
+
+
+def load_checkpoint(path: str, visited) -> dict | None:
+    """
+    Зчитує контрольну точку, якщо вона є, і відновлює сховище відвіданих сторінок.
+
+    :param path: str, шлях до файлу контрольної точки.
+    :param visited: сховище відвіданих сторінок того самого типу, що й
+        при збереженні; його вміст замінюється збереженим.
+    :return: dict | None, стан обходу або None, якщо точки немає.
+    :raises ValueError: якщо файли контрольної точки пошкоджені або
+        збережені іншим типом сховища.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        state = json.load(file)
+    if state.get("version") not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Непідтримувана версія контрольної точки: {path}")
+    if state["visited_store"] != visited.kind:
+        raise ValueError(f"Контрольну точку {path} збережено сховищем "
+                         f"\"{state['visited_store']}\", а не \"{visited.kind}\".")
+    visited_file = state.get("visited_file", os.path.basename(path) + ".visited")
+    with open(os.path.join(os.path.dirname(path), visited_file), "rb") as file:
+        visited.load(file)
+    if len(visited) != state["visited_count"]:
+        raise ValueError(f"Контрольна точка {path} пошкоджена.")
+    return state
+
+
+def remove_checkpoint(path: str):
+    """
+    Видаляє файли контрольної точки після успішного завершення обходу.
+
+    :param path: str, шлях до файлу контрольної точки.
+    """
+    for name in _visited_files(path):
+        os.remove(name)
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,367 @@
+"""Паралельний обхід веб-сторінок у ширину"""
+
+import threading
+import time
+import http.client
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+from crawl_checkpoint import load_checkpoint, remove_checkpoint, save_checkpoint
+from host_scheduler import HostScheduler
+from instrumentation import count, timed_iter, timer
+from link_extractor import LinkExtractor
+from visited_store import FingerprintVisitedStore
+
+USER_AGENT = "WebsiteRankingBot/1.0"
+MAX_REDIRECTS = 5
+CHECKPOINT_INTERVAL = 30.0
+CHECKPOINT_COST_RATIO = 20
+
+
+def is_url(url: str) -> bool:
+    """
+    Перевіряє, чи є рядок повноцінною HTTP(S)-URL-адресою.
+
+    :param url: str, рядок для перевірки.
+    :return: bool, True, якщо починається з "http://" або "https://",
+             інакше False.
+    """
+    return url.startswith("http://") or url.startswith("https://")
+
+
+class ConnectionPool:
+    """
+    Спільні keep-alive з'єднання, згруповані за хостами.
+
+    Потік бере з'єднання з хостом (acquire) на час одного запиту і
+    повертає його (release), тож наступний запит до того самого хоста
+    з будь-якого потоку не відкриває нове TCP/TLS з'єднання. Для
+    кожного хоста зберігається не більше max_idle вільних з'єднань.
+    """
+
+    def __init__(self, timeout: float = 5, max_idle: int = 4):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """
+        Бере вільне з'єднання з хостом або створює нове.
+
+        :param scheme: str, "http" або "https".
+        :param netloc: str, хост (і порт) сервера.
+        :return: http.client.HTTPConnection, з'єднання з хостом.
+        """
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, conn: http.client.HTTPConnection):
+        """
+        Повертає з'єднання до пулу для наступних запитів до хоста.
+
+        :param scheme: str, "http" або "https".
+        :param netloc: str, хост (і порт) сервера.
+        :param conn: http.client.HTTPConnection, з'єднання після прочитаної відповіді.
+        """
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        """Закриває всі вільні з'єднання пулу."""
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+def fetch_html(url: str, pool: ConnectionPool, cache=None) -> str | None:
+    """
+    Завантажує HTML-вміст сторінки через keep-alive з'єднання пулу.
+
+    Перенаправлення (3xx) виконуються так само, як в urlopen; відповіді
+    з кодами 4xx/5xx та помилки мережі дають None. Якщо повторно
+    використане з'єднання виявилось закритим сервером, запит
+    повторюється один раз на новому з'єднанні.
+
+    Якщо передано cache, свіжа сторінка береться з кешу без запиту,
+    а застаріла перевіряється умовним запитом (відповідь 304 означає,
+    що можна використати збережене тіло).
+
+    :param url: str, URL сторінки, яку потрібно завантажити.
+    :param pool: ConnectionPool, пул з'єднань.
+    :param cache: fetch_cache.FetchCache | None, дисковий кеш сторінок.
+    :return: str | None, текст HTML або None, якщо сталася помилка.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        headers = {"User-Agent": USER_AGENT}
+        if cache is not None:
+            body, conditional = cache.lookup(url)
+            if body is not None:
+                return body.decode("utf-8", errors="ignore")
+            headers.update(conditional)
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for attempt in range(2):
+            conn = pool.acquire(parts.scheme, parts.netloc)
+            try:
+                with timer("fetch.request"):
+                    conn.request("GET", path, headers=headers)
+                    resp = conn.getresponse()
+                    body = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError, http.client.CannotSendRequest):
+                conn.close()
+                count("fetch.reconnects")
+                if attempt:
+                    count("fetch.errors")
+                    return None
+                continue
+            except Exception:
+                conn.close()
+                count("fetch.errors")
+                return None
+            count("fetch.responses")
+            count("fetch.bytes", len(body))
+            if resp.will_close:
+                conn.close()
+            else:
+                pool.release(parts.scheme, parts.netloc, conn)
+            break
+        if resp.status == 304 and cache is not None:
+            body = cache.revalidate(url)
+            return None if body is None else body.decode("utf-8", errors="ignore")
+        location = resp.getheader("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            if not is_url(url):
+                return None
+            continue
+        if resp.status >= 400:
+            count("fetch.http_errors")
+            return None
+        if cache is not None:
+            cache.store(url, body, resp.getheader("ETag"), resp.getheader("Last-Modified"))
+        with timer("fetch.decode"):
+            return body.decode("utf-8", errors="ignore")
+    return None
+
+
+def cached_html(url: str, cache) -> str | None:
+    """
+    Повертає сторінку зі свіжого запису кешу без запиту до мережі.
+
+    :param url: str, URL сторінки.
+    :param cache: fetch_cache.FetchCache, дисковий кеш сторінок.
+    :return: str | None, текст HTML або None, якщо свіжого запису немає.
+    """
+    body, _ = cache.lookup(url)
+    return None if body is None else body.decode("utf-8", errors="ignore")
+
+
+def fetch_robots(scheme: str, netloc: str, pool: ConnectionPool) -> RobotFileParser | None:
+    """
+    Завантажує та розбирає robots.txt хоста.
+
+    :param scheme: str, "http" або "https".
+    :param netloc: str, хост (і порт) сервера.
+    :param pool: ConnectionPool, пул з'єднань.
+    :return: urllib.robotparser.RobotFileParser | None, правила хоста або
+        None, якщо robots.txt немає (тоді дозволено все).
+    """
+    with timer("fetch.robots"):
+        text = fetch_html(f"{scheme}://{netloc}/robots.txt", pool)
+    if text is None:
+        return None
+    robots = RobotFileParser()
+    robots.parse(text.splitlines())
+    return robots
+
+
+def crawl(start_url: str, max_depth: int, output_path: str, max_links_per_page: int,
+          workers: int = 8, log=None, fetch=None, cache=None, extractor=None,
+          cancel=None, progress=None, checkpoint_path: str | None = None,
+          checkpoint_interval: float = CHECKPOINT_INTERVAL, resume: bool = False, visited=None,
+          per_host: int = 2, delay: float = 0.0, respect_robots: bool = True) -> bool:
+    """
+    Обходить веб-сторінки в ширину, завантажуючи кожен рівень паралельно.
+
+    Сторінки одного рівня глибини завантажуються одночасно workers
+    потоками, тож час обходу визначається не сумою затримок мережі, а
+    кількістю рівнів. Завантаження розподіляє host_scheduler.HostScheduler:
+    до одного хоста одночасно йде не більше per_host запитів з
+    інтервалом щонайменше delay секунд (або Crawl-delay з robots.txt),
+    а сторінки, заборонені в robots.txt, не завантажуються. Сторінки,
+    свіжі у cache, віддаються одразу, без черги хоста і без затримки.
+    Запити й перевірка robots.txt використовують один агент USER_AGENT.
+    Ребра записуються у файл у форматі:
+        source_url -> destination_url
+
+    Обмеження такі самі, як у search_links: сторінки на глибині
+    max_depth завантажуються, але їхні посилання вже не обходяться;
+    з однієї сторінки береться не більше max_links_per_page унікальних
+    посилань. Відвідані сторінки зберігаються у сховищі visited (за
+    замовчуванням – компактна таблиця 64-бітних відбитків URL).
+
+    Якщо задано checkpoint_path, не частіше ніж раз на checkpoint_interval
+    секунд (і при скасуванні) на диск записується контрольна точка: черга,
+    відвідані сторінки та позиція у файлі ребер. Збереження пише все
+    сховище visited, тож його ціна росте з обходом; тому наступне
+    збереження відкладається ще й щонайменше на CHECKPOINT_COST_RATIO
+    тривалостей попереднього, і контрольні точки забирають не більше
+    1/CHECKPOINT_COST_RATIO часу обходу за будь-якого його розміру. З resume=True обхід продовжується
+    з контрольної точки: файл ребер обрізається до збереженої позиції,
+    а нові ребра дописуються в кінець. Після успішного завершення
+    контрольна точка видаляється.
+
+    Якщо ввімкнено instrumentation, збираються таймери fetch.request,
+    fetch.decode, crawl.wait (очікування на завантаження), crawl.extract,
+    crawl.write, crawl.checkpoint та лічильники сторінок, ребер і байтів.
+
+    :param start_url: str, URL, з якої починається обхід.
+    :param max_depth: int, максимальна глибина обходу.
+    :param output_path: str, шлях до файлу, куди будуть записані ребра графа.
+    :param max_links_per_page: int, максимальна кількість посилань,
+        які беруться з однієї сторінки.
+    :param workers: int, кількість одночасних завантажень.
+    :param log: callable | None, функція для виводу знайдених посилань.
+    :param fetch: callable | None, функція url -> html | None
+        (за замовчуванням fetch_html з keep-alive пулом).
+    :param cache: fetch_cache.FetchCache | None, дисковий кеш сторінок для
+        fetch_html; наприкінці обходу його лічильники виводяться в log.
+    :param extractor: link_extractor.LinkExtractor | None, фільтри посилань
+        (за замовчуванням LinkExtractor()).
+    :param cancel: threading.Event | None, подія для зупинки обходу;
+        перевіряється після кожної завантаженої сторінки.
+    :param progress: callable | None, функція, яка після кожної сторінки
+        отримує словник лічильників: pages, pages_per_sec, edges, queue, depth.
+    :param checkpoint_path: str | None, файл контрольної точки (None – без них).
+    :param checkpoint_interval: float, мінімальний інтервал між контрольними
+        точками (с).
+    :param resume: bool, чи продовжувати обхід з контрольної точки.
+    :param visited: сховище відвіданих сторінок з visited_store | None
+        (за замовчуванням FingerprintVisitedStore()); на початку нового
+        обходу воно очищується.
+    :param per_host: int, максимум одночасних запитів до одного хоста.
+    :param delay: float, мінімальний інтервал між запитами до одного хоста (с).
+    :param respect_robots: bool, чи перевіряти robots.txt (лише для
+        стандартного fetch).
+    :return: bool, True, якщо обхід завершено, False, якщо його скасовано.
+    :raises ValueError: якщо контрольна точка належить іншому обходу.
+    """
+    if extractor is None:
+        extractor = LinkExtractor()
+    pool = ConnectionPool(max_idle=per_host)
+    robots = None
+    local = None
+    if fetch is None:
+        if cache is not None:
+            def local(url: str) -> str | None:
+                return cached_html(url, cache)
+
+        def fetch(url: str) -> str | None:
+            return fetch_html(url, pool, cache)
+
+        if respect_robots:
+            def robots(scheme: str, netloc: str) -> RobotFileParser | None:
+                return fetch_robots(scheme, netloc, pool)
+    params = {"start_url": start_url, "max_depth": max_depth,
+              "max_links_per_page": max_links_per_page}
+    if visited is None:
+        visited = FingerprintVisitedStore()
+    state = None
+    if resume and checkpoint_path:
+        state = load_checkpoint(checkpoint_path, visited)
+    if state is not None:
+        if any(state[key] != value for key, value in params.items()):
+            raise ValueError("Контрольна точка належить обходу з іншими параметрами.")
+        frontier = state["frontier"]
+        next_frontier = state["next_frontier"]
+        depth, pages, edges = state["depth"], state["pages"], state["edges"]
+        with open(output_path, "ab") as file:
+            file.truncate(state["offset"])
+        mode = "a"
+        if log is not None:
+            log(f"Продовжуємо обхід: {pages} сторінок, {edges} ребер, "
+                f"{len(frontier) + len(next_frontier)} у черзі.")
+    else:
+        visited.clear()
+        visited.add(start_url)
+        frontier = [start_url]
+        next_frontier = []
+        depth = pages = edges = 0
+        mode = "w"
+    started = time.perf_counter()
+    pages_at_start = pages
+    cancelled = False
+    next_checkpoint = started + checkpoint_interval
+    scheduler = HostScheduler(fetch, workers, per_host, delay, robots, USER_AGENT, local)
+    try:
+        with open(output_path, mode, encoding="utf-8") as f_out:
+            def save(position: int):
+                f_out.flush()
+                save_checkpoint(checkpoint_path, dict(
+                    params, depth=depth, frontier=frontier[position + 1:],
+                    next_frontier=next_frontier, offset=f_out.tell(),
+                    pages=pages, edges=edges), visited)
+
+            while frontier and depth <= max_depth and not cancelled:
+                results = timed_iter("crawl.wait", scheduler.map(frontier))
+                for position, (url, html) in enumerate(zip(frontier, results)):
+                    pages += 1
+                    if html is not None:
+                        with timer("crawl.extract"):
+                            links = extractor.extract(url, html, max_links_per_page)
+                        with timer("crawl.write"):
+                            for full_url in links:
+                                f_out.write(f"{url} -> {full_url}\n")
+                                if log is not None:
+                                    log(f"   -> {full_url}")
+                                if depth < max_depth and visited.add(full_url):
+                                    next_frontier.append(full_url)
+                        edges += len(links)
+                        count("crawl.edges", len(links))
+                    count("crawl.pages")
+                    if progress is not None:
+                        elapsed = time.perf_counter() - started
+                        progress({"pages": pages,
+                                  "pages_per_sec": (pages - pages_at_start) / elapsed
+                                  if elapsed else 0.0,
+                                  "edges": edges,
+                                  "queue": len(frontier) - position - 1 + len(next_frontier),
+                                  "depth": depth})
+                    if cancel is not None and cancel.is_set():
+                        cancelled = True
+                    if checkpoint_path and (cancelled or time.perf_counter() >= next_checkpoint):
+                        with timer("crawl.checkpoint"):
+                            saving = time.perf_counter()
+                            save(position)
+                            now = time.perf_counter()
+                        next_checkpoint = now + max(checkpoint_interval,
+                                                    CHECKPOINT_COST_RATIO * (now - saving))
+                    if cancelled:
+                        break
+                if not cancelled:
+                    frontier = next_frontier
+                    next_frontier = []
+                    depth += 1
+    finally:
+        scheduler.shutdown(wait=not cancelled)
+        pool.close_all()
+    if checkpoint_path and not cancelled:
+        remove_checkpoint(checkpoint_path)
+    if cache is not None and log is not None:
+        log(cache.stats_message())
+    return not cancelled
@@ -0,0 +1,181 @@
+"""Дисковий кеш завантажених сторінок з умовною перевіркою (ETag / Last-Modified)"""
+
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+ACCESS_FLUSH = 1000
+
+
+def normalize_url(url: str) -> str:
+    """
+    Приводить URL до канонічного вигляду для ключа кешу.
+
+    Схема та хост переводяться в нижній регістр, стандартний порт
+    і фрагмент (#...) прибираються, порожній шлях замінюється на "/".
+
+    :param url: str, URL сторінки.
+    :return: str, нормалізований URL.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class FetchCache:
+    """
+    Кеш HTML-сторінок у файлі SQLite з витісненням за LRU.
+
+    Для кожного URL зберігаються тіло відповіді, ETag, Last-Modified,
+    час завантаження та час останнього звернення. Запис вважається
+    свіжим протягом ttl секунд; після цього сторінку треба перевірити
+    умовним запитом (If-None-Match / If-Modified-Since). Коли сумарний
+    розмір тіл перевищує max_bytes, видаляються записи, до яких
+    зверталися найдавніше.
+
+    Час звернення при влучанні не записується одразу (це була б
+    транзакція з fsync на кожне читання): він накопичується в пам'яті
+    й записується разом з наступним store() чи revalidate(), кожні
+    ACCESS_FLUSH влучань і в close().
+
+    Лічильники:
+      hits – свіжі записи, віддані без запиту до мережі;
+      revalidated – записи, підтверджені відповіддю 304;
+      misses – сторінки, завантажені повністю.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._accessed = {}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS pages ("
+                         "url TEXT PRIMARY KEY, body BLOB, etag TEXT, "
+                         "last_modified TEXT, fetched_at REAL, accessed_at REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_lru ON pages (accessed_at)")
+        self._db.commit()
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(body)), 0) FROM pages").fetchone()[0]
+
+    def lookup(self, url: str) -> tuple[bytes | None, dict]:
+        """
+        Шукає сторінку в кеші.
+
+        :param url: str, URL сторінки.
+        :return: tuple[bytes | None, dict], тіло свіжого запису (або None,
+            якщо запису немає чи він застарів) та заголовки для умовного
+            запиту (порожній словник, якщо запису немає).
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT body, etag, last_modified, fetched_at "
+                                   "FROM pages WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return None, {}
+            body, etag, last_modified, fetched_at = row
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_FLUSH:
+                self._flush_accessed()
+                self._db.commit()
+            if now - fetched_at < self.ttl:
+                self.hits += 1
+                return body, {}
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return None, headers
+
+    def revalidate(self, url: str) -> bytes | None:
+        """
+        Позначає запис свіжим після відповіді 304 і повертає його тіло.
+
+        :param url: str, URL сторінки.
+        :return: bytes | None, тіло збереженої сторінки.
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT body FROM pages WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._accessed.pop(key, None)
+            self._flush_accessed()
+            self._db.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                             (now, now, key))
+            self._db.commit()
+            self.revalidated += 1
+        return row[0]
+
+    def store(self, url: str, body: bytes, etag: str | None, last_modified: str | None):
+        """
+        Зберігає завантажену сторінку та за потреби витісняє старі записи.
+
+        Сумарний розмір тіл ведеться в пам'яті (_total_bytes), тож запис
+        не перераховує розмір усієї таблиці.
+
+        :param url: str, URL сторінки.
+        :param body: bytes, тіло відповіді.
+        :param etag: str | None, заголовок ETag.
+        :param last_modified: str | None, заголовок Last-Modified.
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            self.misses += 1
+            self._accessed.pop(key, None)
+            self._flush_accessed()
+            old = self._db.execute("SELECT LENGTH(body) FROM pages WHERE url = ?",
+                                   (key,)).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                             (key, body, etag, last_modified, now, now))
+            self._total_bytes += len(body) - (old[0] or 0 if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def _flush_accessed(self):
+        """Записує накопичені часи звернень у таблицю (без commit, під self._lock)."""
+        if self._accessed:
+            self._db.executemany("UPDATE pages SET accessed_at = ? WHERE url = ?",
+                                 ((when, key) for key, when in self._accessed.items()))
+            self._accessed.clear()
+
+    def _evict(self):
+        """Видаляє найдавніше використані записи, доки кеш не влізе в max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT url, LENGTH(body) FROM pages ORDER BY accessed_at")
+        stale = []
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            stale.append((key,))
+            self._total_bytes -= size or 0
+        self._db.executemany("DELETE FROM pages WHERE url = ?", stale)
+
+    def stats_message(self) -> str:
+        """
+        Формує рядок з лічильниками кешу для логу.
+
+        :return: str, повідомлення з кількістю влучань, перевірок та промахів.
+        """
+        return (f"Кеш сторінок: {self.hits} влучань, {self.revalidated} "
+                f"підтверджено (304), {self.misses} промахів")
+
+    def close(self):
+        """Записує накопичені часи звернень і закриває базу даних кешу."""
+        with self._lock:
+            self._flush_accessed()
+            self._db.commit()
+            self._db.close()
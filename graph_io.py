@@ -0,0 +1,304 @@
+"""Потокове зчитування графа посилань з компактним зберіганням ребер"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from instrumentation import timer
+
+BINARY_MAGIC = b"WRGRAPH1"
+BINARY_HEADER = struct.Struct("<8sIIQQQ")
+BYTE_ORDER_MARK = 0x01020304
+INDEX_TYPECODES = {0: ('Q', 'I'), 4: ('i', 'i'), 8: ('q', 'q')}
+
+
+def iter_edges(file_obj):
+    """
+    Ліниво розбирає рядки формату "src -> dst" з файлового об'єкта.
+
+    Порожні рядки, рядки без "->" та рядки з порожнім кінцем ребра
+    пропускаються так само, як у create_dictionaries.
+
+    :param file_obj: iterable[str], відкритий текстовий файл або інший
+        ітерований набір рядків.
+    :return: iterator[tuple[str, str]], пари (src, dst).
+    """
+    for elem in file_obj:
+        if '->' not in elem:
+            continue
+        start_point, end_point = elem.split('->', 1)
+        start_point = start_point.strip()
+        end_point = end_point.strip()
+        if start_point and end_point:
+            yield start_point, end_point
+
+
+def load_edge_list(file_obj) -> tuple:
+    """
+    Зчитує граф у компактному вигляді: таблиця URL + масиви номерів.
+
+    Кожен URL зберігається один раз і отримує цілий номер у порядку
+    першої появи. Ребра додаються в два масиви array('I') (4 байти на
+    кінець ребра) замість словників множин рядків. Повторні ребра
+    не відкидаються.
+
+    :param file_obj: iterable[str], відкритий текстовий файл з ребрами.
+    :return: tuple[list[str], dict[str, int], array, array], кортеж
+        (urls, index, sources, targets), де urls[i] – URL вершини i,
+        index – словник {URL: номер}, а sources[k] -> targets[k] – k-те ребро.
+    """
+    urls = []
+    index = {}
+    sources = array('I')
+    targets = array('I')
+    for start_point, end_point in iter_edges(file_obj):
+        src = index.get(start_point)
+        if src is None:
+            src = index[start_point] = len(urls)
+            urls.append(start_point)
+        dst = index.get(end_point)
+        if dst is None:
+            dst = index[end_point] = len(urls)
+            urls.append(end_point)
+        sources.append(src)
+        targets.append(dst)
+    return urls, index, sources, targets
+
+
+def edge_list_to_dictionaries(urls: list[str], sources, targets) -> tuple:
+    """
+    Перетворює компактний граф на кортеж, який повертає create_dictionaries.
+
+    :param urls: list[str], таблиця URL.
+    :param sources: array, номери початків ребер.
+    :param targets: array, номери кінців ребер.
+    :return: tuple[dict, dict, dict, set, set], кортеж
+        (vertical_in, vertical_out, page_rank, vertexes, not_used_vertexes).
+    """
+    vertical_out = {}
+    vertical_in = {}
+    for src, dst in zip(sources, targets):
+        start_point = urls[src]
+        end_point = urls[dst]
+        vertical_out.setdefault(start_point, set()).add(end_point)
+        vertical_in.setdefault(end_point, set()).add(start_point)
+    vertexes = set(urls)
+    if not vertexes:
+        return vertical_in, vertical_out, {}, vertexes, set()
+    page_rank = dict.fromkeys(sorted(vertexes), 1 / len(vertexes))
+    return vertical_in, vertical_out, page_rank, vertexes, set()
+
+
+def read_graph(file_name: str) -> tuple:
+    """
+    Зчитує файл з ребрами потоково і повертає структури create_dictionaries.
+
+    Заміна для create_dictionaries(read_file(file_name)), яка не
+    тримає в пам'яті весь список рядків файлу.
+
+    :param file_name: str, шлях до файлу (наприклад, "menu.dot").
+    :return: tuple[dict, dict, dict, set, set], кортеж
+        (vertical_in, vertical_out, page_rank, vertexes, not_used_vertexes).
+    """
+    with open(file_name, 'r', encoding='utf-8') as file, timer("graph.read"):
+        urls, _, sources, targets = load_edge_list(file)
+    with timer("graph.build"):
+        return edge_list_to_dictionaries(urls, sources, targets)
+
+
+def _align(position: int, size: int = 8) -> int:
+    """
+    Округлює позицію у файлі вгору до кратної size.
+
+    :param position: int, позиція в байтах.
+    :param size: int, вирівнювання в байтах.
+    :return: int, вирівняна позиція.
+    """
+    return (position + size - 1) // size * size
+
+
+def edge_list_to_csr(num_vertexes: int, sources, targets) -> tuple[array, array]:
+    """
+    Перетворює список ребер на CSR-масиви (зсуви рядків + кінці ребер).
+
+    Ребра групуються за початком (сортування підрахунком), кінці
+    кожного рядка сортуються, а повторні ребра відкидаються – як у
+    словниках множин create_dictionaries.
+
+    :param num_vertexes: int, кількість вершин.
+    :param sources: array, номери початків ребер.
+    :param targets: array, номери кінців ребер.
+    :return: tuple[array, array], (row_offsets, csr_targets), де кінці
+        ребер вершини i – csr_targets[row_offsets[i]:row_offsets[i + 1]].
+    """
+    counts = array('Q', bytes(8 * (num_vertexes + 1)))
+    for src in sources:
+        counts[src + 1] += 1
+    for i in range(num_vertexes):
+        counts[i + 1] += counts[i]
+    slots = array('I', bytes(4 * len(targets)))
+    fill = array('Q', counts)
+    for src, dst in zip(sources, targets):
+        slots[fill[src]] = dst
+        fill[src] += 1
+    row_offsets = array('Q', [0])
+    csr_targets = array('I')
+    for i in range(num_vertexes):
+        csr_targets.extend(sorted(set(slots[counts[i]:counts[i + 1]])))
+        row_offsets.append(len(csr_targets))
+    return row_offsets, csr_targets
+
+
+def index_size(num_vertexes: int, num_edges: int) -> int:
+    """
+    Вибирає розмір індексів CSR так само, як scipy.sparse.
+
+    scipy зберігає indptr та indices в одному знаковому типі: int32,
+    якщо всі значення менші за 2**31, інакше int64. Файл з тим самим
+    типом можна передати в scipy без перетворення (і копіювання) масивів.
+
+    :param num_vertexes: int, кількість вершин N.
+    :param num_edges: int, кількість ребер M.
+    :return: int, 4 (int32) або 8 (int64) байтів на індекс.
+    """
+    return 4 if max(num_vertexes, num_edges) < 2 ** 31 else 8
+
+
+def write_binary_graph(file_name: str, urls: list[str], row_offsets, csr_targets):
+    """
+    Записує граф у бінарному форматі.
+
+    Структура файлу (усі числа в порядку байтів little-endian):
+      заголовок – magic, позначка порядку байтів, розмір індексу
+      (index_size: 4 або 8), кількість вершин N, кількість ребер M,
+      розмір таблиці рядків;
+      row_offsets – N + 1 знакових індексів;
+      string_offsets – N + 1 чисел uint64 (межі URL у таблиці рядків);
+      targets – M знакових індексів;
+      таблиця рядків – усі URL в UTF-8 підряд.
+    Усі масиви вирівняні на 8 байтів, тому їх можна відобразити в
+    пам'ять без копіювання. Файли старої версії (розмір індексу 0:
+    row_offsets uint64, targets uint32) теж читаються, але scipy
+    перетворює їхні масиви з копіюванням.
+
+    :param file_name: str, шлях до вихідного файлу.
+    :param urls: list[str], таблиця URL.
+    :param row_offsets: array, зсуви рядків CSR.
+    :param csr_targets: array, кінці ребер CSR.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Бінарний формат графа підтримує лише little-endian.")
+    encoded = [url.encode("utf-8") for url in urls]
+    string_offsets = array('Q', [0])
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    size = index_size(len(urls), len(csr_targets))
+    offsets_code, targets_code = INDEX_TYPECODES[size]
+    with open(file_name, "wb") as file:
+        file.write(BINARY_HEADER.pack(BINARY_MAGIC, BYTE_ORDER_MARK, size, len(urls),
+                                      len(csr_targets), string_offsets[-1]))
+        file.write(array(offsets_code, row_offsets).tobytes())
+        file.write(bytes(_align(file.tell()) - file.tell()))
+        file.write(string_offsets.tobytes())
+        file.write(array(targets_code, csr_targets).tobytes())
+        file.write(bytes(_align(file.tell()) - file.tell()))
+        for data in encoded:
+            file.write(data)
+
+
+def convert_edge_file(dot_name: str, binary_name: str):
+    """
+    Конвертує текстовий файл з ребрами "src -> dst" у бінарний формат.
+
+    :param dot_name: str, шлях до текстового файлу (наприклад, "menu.dot").
+    :param binary_name: str, шлях до бінарного файлу.
+    """
+    with open(dot_name, 'r', encoding='utf-8') as file:
+        urls, _, sources, targets = load_edge_list(file)
+    row_offsets, csr_targets = edge_list_to_csr(len(urls), sources, targets)
+    write_binary_graph(binary_name, urls, row_offsets, csr_targets)
+
+
+class BinaryGraph:
+    """
+    Граф у бінарному форматі, відображений у пам'ять (mmap).
+
+    row_offsets та targets – memoryview безпосередньо над файлом у
+    типі індексів scipy (int32 або int64, див. index_size), тож ні
+    відкриття графа, ні побудова матриці переходів
+    (pagerank_engine.transition_matrix_from_csr) їх не копіюють. URL
+    декодуються лише на запит.
+    """
+
+    def __init__(self, file_name: str):
+        with open(file_name, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, mark, size, self.num_vertexes, self.num_edges,
+         strings_size) = BINARY_HEADER.unpack_from(self._mmap, 0)
+        if magic != BINARY_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Файл {file_name} не є бінарним графом.")
+        if mark != BYTE_ORDER_MARK or sys.byteorder != "little":
+            self._mmap.close()
+            raise ValueError("Бінарний формат графа підтримує лише little-endian.")
+        if size not in INDEX_TYPECODES:
+            self._mmap.close()
+            raise ValueError(f"Невідомий розмір індексу у файлі {file_name}: {size}.")
+        offsets_code, targets_code = INDEX_TYPECODES[size]
+        offsets_width = array(offsets_code).itemsize
+        targets_width = array(targets_code).itemsize
+        view = memoryview(self._mmap)
+        position = BINARY_HEADER.size
+        end = position + offsets_width * (self.num_vertexes + 1)
+        self.row_offsets = view[position:end].cast(offsets_code)
+        position = _align(end)
+        end = position + 8 * (self.num_vertexes + 1)
+        self._string_offsets = view[position:end].cast('Q')
+        position = end
+        end = position + targets_width * self.num_edges
+        self.targets = view[position:end].cast(targets_code)
+        position = _align(end)
+        self._strings = view[position:position + strings_size]
+        self._view = view
+
+    def url(self, vertex: int) -> str:
+        """
+        Повертає URL вершини за її номером.
+
+        :param vertex: int, номер вершини.
+        :return: str, URL вершини.
+        """
+        start = self._string_offsets[vertex]
+        end = self._string_offsets[vertex + 1]
+        return bytes(self._strings[start:end]).decode("utf-8")
+
+    def urls(self) -> list[str]:
+        """
+        Декодує всю таблицю URL.
+
+        :return: list[str], URL за номерами вершин.
+        """
+        return [self.url(i) for i in range(self.num_vertexes)]
+
+    def out_edges(self, vertex: int):
+        """
+        Повертає номери вершин, на які посилається вершина.
+
+        :param vertex: int, номер вершини.
+        :return: memoryview, кінці вихідних ребер вершини.
+        """
+        return self.targets[self.row_offsets[vertex]:self.row_offsets[vertex + 1]]
+
+    def close(self):
+        """Звільняє memoryview та закриває відображення файлу."""
+        for view in (self.row_offsets, self._string_offsets, self.targets,
+                     self._strings, self._view):
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,293 @@
+"""Масштабована візуалізація графа: топ-k підграф або граф хостів, DOT/SVG/PNG"""
+
+import hashlib
+import json
+import math
+import os
+from urllib.parse import urlsplit
+
+from ranking import top_k_items
+
+LAYOUT_CACHE = "graph_layout.json"
+MAX_CACHED_LAYOUTS = 32
+
+
+def in_degree_scores(vertical_out: dict) -> dict[str, float]:
+    """
+    Рахує кількість вхідних посилань кожної вершини.
+
+    Використовується замість PageRank, якщо його ще не пораховано.
+
+    :param vertical_out: dict[str, set[str]], словник вихідних ребер.
+    :return: dict[str, float], словник {вершина: кількість вхідних ребер}.
+    """
+    scores = dict.fromkeys(vertical_out, 0.0)
+    for ends in vertical_out.values():
+        for end in ends:
+            scores[end] = scores.get(end, 0.0) + 1.0
+    return scores
+
+
+def top_subgraph(vertical_out: dict, scores: dict, k: int = 50) -> tuple:
+    """
+    Вибирає k найкращих вершин і ребра лише між ними.
+
+    Перебираються тільки вихідні ребра вибраних вершин, тож ціна
+    O(N log k + сума їхніх степенів), а не всього графа.
+
+    :param vertical_out: dict[str, set[str]], словник вихідних ребер.
+    :param scores: dict[str, float], PageRank (або інша оцінка) вершин.
+    :param k: int, кількість вершин у підграфі.
+    :return: tuple[dict[str, float], dict[tuple[str, str], int]], вершини
+        з оцінками та ребра з вагою 1.
+    """
+    nodes = dict(top_k_items(scores, k))
+    edges = {(start, end): 1 for start in nodes
+             for end in vertical_out.get(start, ()) if end in nodes and end != start}
+    return nodes, edges
+
+
+def host_subgraph(vertical_out: dict, scores: dict, k: int | None = None) -> tuple:
+    """
+    Згортає граф сторінок у граф хостів.
+
+    Оцінка хоста – сума оцінок його сторінок (для PageRank це частка
+    випадкового блукача, що перебуває на хості), вага ребра – кількість
+    посилань між сторінками двох хостів. Посилання всередині хоста
+    відкидаються.
+
+    :param vertical_out: dict[str, set[str]], словник вихідних ребер.
+    :param scores: dict[str, float], PageRank (або інша оцінка) сторінок.
+    :param k: int | None, скільки найкращих хостів залишити (None – усі).
+    :return: tuple[dict[str, float], dict[tuple[str, str], int]], хости
+        з оцінками та зважені ребра між ними.
+    """
+    hosts = {}
+    host_scores = {}
+    for url, score in scores.items():
+        host = hosts[url] = urlsplit(url).netloc.lower()
+        host_scores[host] = host_scores.get(host, 0.0) + score
+    if k is not None:
+        host_scores = dict(top_k_items(host_scores, k))
+    edges = {}
+    for start, ends in vertical_out.items():
+        source = hosts.get(start) or urlsplit(start).netloc.lower()
+        if source not in host_scores:
+            continue
+        for end in ends:
+            target = hosts.get(end) or urlsplit(end).netloc.lower()
+            if target != source and target in host_scores:
+                edges[source, target] = edges.get((source, target), 0) + 1
+    return host_scores, edges
+
+
+def graph_hash(nodes, edges) -> str:
+    """
+    Рахує відбиток структури графа (вершини й ребра, без оцінок).
+
+    :param nodes: iterable[str], вершини графа.
+    :param edges: iterable[tuple[str, str]], ребра графа.
+    :return: str, шістнадцятковий blake2b-відбиток.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for node in sorted(nodes):
+        digest.update(node.encode("utf-8") + b"\n")
+    digest.update(b"\0")
+    for start, end in sorted(edges):
+        digest.update(f"{start}\t{end}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cached_layout(nodes, edges, cache_path: str | None = LAYOUT_CACHE) -> dict:
+    """
+    Повертає координати вершин, рахуючи spring_layout лише для нового графа.
+
+    Розкладки зберігаються у JSON-файлі за відбитком graph_hash (не
+    більше MAX_CACHED_LAYOUTS останніх), тож повторне малювання того
+    самого підграфа (наприклад, з іншими кольорами чи у іншому форматі)
+    не перераховує розкладку.
+
+    :param nodes: iterable[str], вершини графа.
+    :param edges: iterable[tuple[str, str]], ребра графа.
+    :param cache_path: str | None, файл кешу (None – без кешу).
+    :return: dict[str, tuple[float, float]], координати вершин.
+    """
+    import networkx as nx
+
+    key = graph_hash(nodes, edges)
+    cache = {}
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            cache = {}
+    if key in cache:
+        return {node: tuple(position) for node, position in cache[key].items()}
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    layout = {node: (float(x), float(y))
+              for node, (x, y) in nx.spring_layout(graph, seed=42).items()}
+    if cache_path:
+        cache.pop(key, None)
+        cache[key] = layout
+        for old_key in list(cache)[:-MAX_CACHED_LAYOUTS]:
+            del cache[old_key]
+        with open(cache_path, "w", encoding="utf-8") as file:
+            json.dump(cache, file)
+    return layout
+
+
+def scale_scores(nodes: dict) -> dict[str, float]:
+    """
+    Переводить оцінки вершин у [0, 1] у логарифмічній шкалі.
+
+    PageRank розподілений за степеневим законом, тож у лінійній шкалі
+    майже всі вершини були б однаково маленькими.
+
+    :param nodes: dict[str, float], вершини з оцінками.
+    :return: dict[str, float], вершини з оцінками від 0 до 1.
+    """
+    positive = [score for score in nodes.values() if score > 0]
+    if not positive:
+        return dict.fromkeys(nodes, 0.0)
+    low, high = min(positive), max(positive)
+    if high == low:
+        return dict.fromkeys(nodes, 1.0)
+    span = math.log(high / low)
+    return {node: math.log(score / low) / span if score > 0 else 0.0
+            for node, score in nodes.items()}
+
+
+def short_label(name: str, limit: int = 30) -> str:
+    """
+    Скорочує URL до шляху (або хоста) для підпису вершини.
+
+    :param name: str, URL або хост.
+    :param limit: int, максимальна довжина підпису.
+    :return: str, підпис.
+    """
+    parts = urlsplit(name)
+    label = (parts.path.rstrip("/") or parts.netloc or name) if parts.scheme else name
+    return label if len(label) <= limit else label[:limit - 1] + "…"
+
+
+def _dot_string(text: str) -> str:
+    """Екранує рядок для Graphviz DOT."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def write_dot(nodes: dict, edges: dict, output_file: str):
+    """
+    Записує граф у форматі Graphviz DOT.
+
+    Розмір і колір вершини залежать від оцінки (scale_scores), товщина
+    ребра – від його ваги. Розкладку робить сам Graphviz
+    (dot -Tsvg graph.dot > graph.svg або sfdp для великих графів).
+
+    :param nodes: dict[str, float], вершини з оцінками.
+    :param edges: dict[tuple[str, str], int], ребра з вагами.
+    :param output_file: str, шлях до .dot-файлу.
+    """
+    scaled = scale_scores(nodes)
+    heaviest = max(edges.values(), default=1)
+    with open(output_file, "w", encoding="utf-8") as file:
+        file.write("digraph G {\n")
+        file.write('  node [shape=circle, style=filled, fixedsize=true, fontsize=10];\n')
+        for node, score in nodes.items():
+            value = scaled[node]
+            file.write(f"  {_dot_string(node)} [label={_dot_string(short_label(node))}, "
+                       f"tooltip={_dot_string(f'{node} ({score:.6g})')}, "
+                       f"width={0.4 + 1.2 * value:.2f}, "
+                       f'fillcolor="{0.6 * (1 - value):.3f} 0.6 1.0"];\n')
+        for (start, end), weight in edges.items():
+            file.write(f"  {_dot_string(start)} -> {_dot_string(end)} "
+                       f"[penwidth={1 + 3 * weight / heaviest:.2f}];\n")
+        file.write("}\n")
+
+
+def draw_graph(nodes: dict, edges: dict, output_file: str,
+               layout_cache: str | None = LAYOUT_CACHE, dpi: int = 150):
+    """
+    Малює граф у PNG/SVG/PDF засобами matplotlib (формат – за розширенням).
+
+    :param nodes: dict[str, float], вершини з оцінками.
+    :param edges: dict[tuple[str, str], int], ребра з вагами.
+    :param output_file: str, шлях до файлу зображення.
+    :param layout_cache: str | None, файл кешу розкладок (див. cached_layout).
+    :param dpi: int, роздільність для растрових форматів.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    scaled = scale_scores(nodes)
+    heaviest = max(edges.values(), default=1)
+    plt.figure(figsize=(10, 8))
+    nx.draw_networkx(
+        graph, cached_layout(nodes, edges, layout_cache),
+        labels={node: short_label(node) for node in graph},
+        node_size=[100 + 1900 * scaled[node] for node in graph],
+        node_color=[scaled[node] for node in graph],
+        cmap="viridis", vmin=0.0, vmax=1.0,
+        width=[0.5 + 2.5 * edges[edge] / heaviest for edge in graph.edges],
+        edge_color="#999999", arrowsize=10, font_size=7
+    )
+    plt.axis("off")
+    plt.savefig(output_file, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
+def heaviest_edges(edges: dict, limit: int | None) -> dict:
+    """
+    Залишає limit ребер з найбільшою вагою.
+
+    :param edges: dict[tuple[str, str], int], ребра з вагами.
+    :param limit: int | None, максимальна кількість ребер (None – усі).
+    :return: dict[tuple[str, str], int], відібрані ребра.
+    """
+    if limit is None or len(edges) <= limit:
+        return edges
+    return dict(top_k_items(edges, limit))
+
+
+def render_graph(vertical_out: dict, output_file: str, page_rank: dict | None = None,
+                 top: int = 50, hosts: bool = False,
+                 layout_cache: str | None = LAYOUT_CACHE,
+                 max_edges: int | None = None) -> tuple:
+    """
+    Візуалізує лише найважливішу частину графа.
+
+    Береться топ-top підграф за PageRank (або граф хостів з top
+    найкращими хостами), а не весь граф, тож розкладка і малювання
+    не залежать від розміру обходу. Формат визначається розширенням:
+    .dot – текст Graphviz без жодних залежностей, інші (.svg, .png,
+    .pdf) малює matplotlib.
+
+    :param vertical_out: dict[str, set[str]], словник вихідних ребер.
+    :param output_file: str, шлях до вихідного файлу.
+    :param page_rank: dict[str, float] | None, PageRank вершин (None –
+        кількість вхідних посилань).
+    :param top: int, кількість вершин (або хостів) на малюнку.
+    :param hosts: bool, чи малювати граф хостів замість сторінок.
+    :param layout_cache: str | None, файл кешу розкладок.
+    :param max_edges: int | None, скільки найважчих ребер малювати
+        (None – 10 * top; граф хостів буває майже повним).
+    :return: tuple[int, int], кількість намальованих вершин і ребер.
+    """
+    scores = page_rank if page_rank is not None else in_degree_scores(vertical_out)
+    if hosts:
+        nodes, edges = host_subgraph(vertical_out, scores, top)
+    else:
+        nodes, edges = top_subgraph(vertical_out, scores, top)
+    edges = heaviest_edges(edges, 10 * top if max_edges is None else max_edges)
+    if output_file.lower().endswith((".dot", ".gv")):
+        write_dot(nodes, edges, output_file)
+    else:
+        draw_graph(nodes, edges, output_file, layout_cache)
+    return len(nodes), len(edges)
@@ -0,0 +1,235 @@
+"""Граф хостів і дворівневий PageRank (BlockRank) для великих графів"""
+
+from urllib.parse import urlsplit
+
+import numpy as np
+from scipy import sparse
+
+from pagerank_engine import (DAMPING, MAX_ITERATIONS, TOLERANCE, build_transition_matrix,
+                             intern_vertexes, power_iteration)
+
+
+def host_of(url: str) -> str:
+    """
+    Повертає хост URL (netloc у нижньому регістрі).
+
+    :param url: str, URL сторінки.
+    :return: str, хост.
+    """
+    return urlsplit(url).netloc.lower()
+
+
+def assign_hosts(urls: list[str]) -> tuple[list[str], np.ndarray]:
+    """
+    Присвоює кожному хосту номер і повертає номер хоста для кожної вершини.
+
+    :param urls: list[str], URL вершин за номером.
+    :return: tuple[list[str], numpy.ndarray], відсортований список хостів
+        та масив номерів хостів вершин.
+    """
+    names = [host_of(url) for url in urls]
+    hosts, index = intern_vertexes(set(names))
+    return hosts, np.array([index[name] for name in names], dtype=np.int64)
+
+
+def aggregate_host_graph(matrix, vertex_hosts: np.ndarray, num_hosts: int,
+                         weights=None, include_internal: bool = False):
+    """
+    Згортає граф сторінок у зважений граф хостів.
+
+    Вага ребра I -> J – сума по всіх ребрах i -> j (i з хоста I, j з
+    хоста J) значень M[j, i] * weights[i]. З weights = None це кількість
+    ребер (кратність), бо M[j, i] * L(i) = 1. Якщо хостів небагато,
+    ваги підсумовуються через np.bincount у щільній матриці хостів, без
+    сортування ребер.
+
+    :param matrix: scipy.sparse матриця переходів сторінок M.
+    :param vertex_hosts: numpy.ndarray, номер хоста для кожної вершини.
+    :param num_hosts: int, кількість хостів.
+    :param weights: numpy.ndarray | None, вага кожної вершини-джерела
+        (None – кратність ребер).
+    :param include_internal: bool, чи залишати ребра всередині хоста (петлі).
+    :return: scipy.sparse.csr_matrix, матриця ваг H[J, I] розміру
+        num_hosts × num_hosts.
+    """
+    edges = sparse.coo_matrix(matrix)
+    if weights is None:
+        out_degree = np.bincount(edges.col, minlength=matrix.shape[1])
+        values = edges.data * out_degree[edges.col]
+    else:
+        values = edges.data * weights[edges.col]
+    sources = vertex_hosts[edges.col]
+    targets = vertex_hosts[edges.row]
+    if not include_internal:
+        external = sources != targets
+        sources, targets, values = sources[external], targets[external], values[external]
+    if num_hosts * num_hosts <= 4 * len(values):
+        dense = np.bincount(targets * num_hosts + sources, weights=values,
+                            minlength=num_hosts * num_hosts)
+        return sparse.csr_matrix(dense.reshape(num_hosts, num_hosts))
+    return sparse.csr_matrix((values, (targets, sources)), shape=(num_hosts, num_hosts))
+
+
+def normalize_columns(weights) -> tuple:
+    """
+    Перетворює матрицю ваг на матрицю переходів (сума кожного стовпця – 1).
+
+    :param weights: scipy.sparse.csr_matrix, матриця ваг H[J, I].
+    :return: tuple[scipy.sparse.csr_matrix, numpy.ndarray], матриця
+        переходів та булева маска "висячих" вершин (стовпців без ваги).
+    """
+    totals = np.asarray(weights.sum(axis=0)).ravel()
+    dangling = totals == 0
+    scale = np.divide(1.0, totals, out=np.zeros_like(totals), where=~dangling)
+    return sparse.csr_matrix(weights @ sparse.diags(scale)), dangling
+
+
+def local_page_rank(matrix, vertex_hosts: np.ndarray, num_hosts: int,
+                    damping: float = DAMPING, tolerance: float = TOLERANCE,
+                    max_iterations: int = MAX_ITERATIONS) -> tuple:
+    """
+    Рахує PageRank кожного хоста окремо (лише за внутрішніми посиланнями).
+
+    Усі хости рахуються одночасно: матриця внутрішніх переходів
+    (рядки CSR-матриці M без зовнішніх ребер, без пересортування)
+    блочно-діагональна, телепортація і "висяча" маса кожного хоста
+    розподіляються лише по його сторінках, тож сума значень кожного
+    хоста дорівнює 1.
+
+    :param matrix: scipy.sparse матриця переходів сторінок M.
+    :param vertex_hosts: numpy.ndarray, номер хоста для кожної вершини.
+    :param num_hosts: int, кількість хостів.
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності за L1-нормою (середній на хост).
+    :param max_iterations: int, максимальна кількість ітерацій.
+    :return: tuple[numpy.ndarray, int], локальний PageRank вершин та
+        кількість ітерацій.
+    """
+    matrix = sparse.csr_matrix(matrix)
+    size = matrix.shape[0]
+    rows = np.repeat(np.arange(size), np.diff(matrix.indptr))
+    internal = vertex_hosts[rows] == vertex_hosts[matrix.indices]
+    columns = matrix.indices[internal]
+    out_degree = np.bincount(columns, minlength=size).astype(np.float64)
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(rows[internal], minlength=size))))
+    local = sparse.csr_matrix((1.0 / out_degree[columns], columns, indptr), shape=(size, size))
+    dangling = np.flatnonzero(out_degree == 0)
+    dangling_hosts = vertex_hosts[dangling]
+    host_sizes = np.bincount(vertex_hosts, minlength=num_hosts).astype(np.float64)
+    share = 1.0 / host_sizes[vertex_hosts]
+    rank = share.copy()
+    iterations = 0
+    while iterations < max_iterations:
+        iterations += 1
+        teleport = 1 - damping + damping * np.bincount(dangling_hosts, weights=rank[dangling],
+                                                       minlength=num_hosts)
+        new_rank = local @ rank
+        new_rank *= damping
+        new_rank += teleport[vertex_hosts] * share
+        delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tolerance * num_hosts:
+            break
+    return rank, iterations
+
+
+def blockrank_start(matrix, dangling, vertex_hosts: np.ndarray, num_hosts: int,
+                    damping: float = DAMPING, tolerance: float = TOLERANCE,
+                    max_iterations: int = MAX_ITERATIONS) -> tuple:
+    """
+    Будує початковий вектор BlockRank для PageRank сторінок.
+
+    Кроки (Kamvar et al., "Exploiting the Block Structure of the Web"):
+      1. локальний PageRank кожного хоста (local_page_rank);
+      2. граф хостів, де внесок сторінки зважено її локальним PageRank
+         (з петлями всередині хоста), і PageRank на ньому;
+      3. початкове значення сторінки = локальний PageRank × PageRank хоста.
+    Усі кроки рахуються з точністю tolerance * 1000: це лише наближення,
+    яке потім уточнює звичайний power_iteration.
+
+    :param matrix: scipy.sparse матриця переходів сторінок M.
+    :param dangling: numpy.ndarray, булева маска "висячих" сторінок.
+    :param vertex_hosts: numpy.ndarray, номер хоста для кожної вершини.
+    :param num_hosts: int, кількість хостів.
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності PageRank сторінок.
+    :param max_iterations: int, максимальна кількість ітерацій.
+    :return: tuple[numpy.ndarray, dict], початковий вектор (сума 1) та
+        звіт: local_iterations, host_iterations.
+    """
+    local, local_iterations = local_page_rank(matrix, vertex_hosts, num_hosts, damping,
+                                              tolerance * 1000, max_iterations)
+    weights = aggregate_host_graph(matrix, vertex_hosts, num_hosts,
+                                   np.where(dangling, 0.0, local), include_internal=True)
+    host_matrix, host_dangling = normalize_columns(weights)
+    host_rank, host_iterations = power_iteration(host_matrix, host_dangling, None, damping,
+                                                 tolerance * 1000, max_iterations)
+    start = local * host_rank[vertex_hosts]
+    return start / start.sum(), {"local_iterations": local_iterations,
+                                 "host_iterations": host_iterations}
+
+
+def host_page_rank(out_in_ribs, peaks, useless_peaks, sort_result: bool = True,
+                   include_internal: bool = False) -> dict[str, float]:
+    """
+    Обчислює PageRank хостів за зваженим графом хостів.
+
+    Вага ребра між хостами – кількість посилань між їхніми сторінками,
+    тож граф хостів у сотні разів менший за граф сторінок і рахується
+    майже миттєво.
+
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер.
+    :param peaks: set[str], множина вершин графа.
+    :param useless_peaks: set[str], множина не потрібних вершин.
+    :param sort_result: bool, чи сортувати результат.
+    :param include_internal: bool, чи враховувати посилання всередині хоста.
+    :return: dict[str, float], словник {хост: PageRank}, відсортований
+        за спаданням значення (якщо sort_result).
+    """
+    if not peaks:
+        return {}
+    urls, index = intern_vertexes(peaks | useless_peaks)
+    matrix, _ = build_transition_matrix(out_in_ribs, index)
+    hosts, vertex_hosts = assign_hosts(urls)
+    weights = aggregate_host_graph(matrix, vertex_hosts, len(hosts),
+                                   include_internal=include_internal)
+    host_matrix, host_dangling = normalize_columns(weights)
+    rank, _ = power_iteration(host_matrix, host_dangling)
+    if not sort_result:
+        return dict(zip(hosts, rank.tolist()))
+    order = np.argsort(-rank, kind="stable")
+    return {hosts[i]: float(rank[i]) for i in order}
+
+
+def blockrank_page_rank(page_rank, out_in_ribs, in_out_ribs, peaks, useless_peaks,
+                        sort_result: bool = True):
+    """
+    Обчислює PageRank сторінок з тими ж аргументами, що й get_page_rank,
+    починаючи з наближення BlockRank замість рівномірного вектора.
+
+    Результат той самий, що й у sparse_page_rank (з точністю tolerance),
+    але на графах, де більшість посилань внутрішні, потрібно менше
+    ітерацій по всьому графу.
+
+    :param page_rank: dict[str, float], початковий словник PageRank
+        (не використовується: стартовий вектор дає BlockRank).
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер.
+    :param in_out_ribs: dict[str, set[str]], словник вхідних ребер
+        (не потрібен для побудови матриці, залишено для сумісності).
+    :param peaks: set[str], множина вершин графа.
+    :param useless_peaks: set[str], множина не потрібних вершин.
+    :param sort_result: bool, чи сортувати результат.
+    :return: dict[str, float], словник PageRank-значень, відсортований
+        за спаданням значення (якщо sort_result).
+    """
+    if not peaks:
+        return {}
+    urls, index = intern_vertexes(peaks | useless_peaks)
+    matrix, dangling = build_transition_matrix(out_in_ribs, index)
+    hosts, vertex_hosts = assign_hosts(urls)
+    start, _ = blockrank_start(matrix, dangling, vertex_hosts, len(hosts))
+    rank, _ = power_iteration(matrix, dangling, start)
+    if not sort_result:
+        return dict(zip(urls, rank.tolist()))
+    order = np.argsort(-rank, kind="stable")
+    return {urls[i]: float(rank[i]) for i in order}
@@ -0,0 +1,226 @@
+"""Планувальник завантажень з обмеженнями для кожного хоста (ввічливий обхід)"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+
+class _HostState:
+    """Черга та обмеження одного хоста."""
+
+    def __init__(self, delay: float):
+        self.queue = deque()
+        self.active = 0
+        self.next_time = 0.0
+        self.delay = delay
+        self.scheduled = False
+        self.robots = None
+
+
+class HostScheduler:
+    """
+    Розподіляє завантаження між потоками так, щоб не перевантажувати жоден хост.
+
+    Черга обходу групується за хостами (схема + netloc). Для кожного
+    хоста одночасно виконується не більше per_host запитів, а запити
+    починаються не частіше ніж раз на delay секунд. Якщо передано
+    robots, перед першим запитом до хоста завантажується robots.txt:
+    сторінки, заборонені для USER_AGENT, не завантажуються (результат
+    None), а Crawl-delay збільшує затримку для хоста. Доки robots.txt
+    хоста не завантажено, до нього йде лише один запит; щойно його
+    завантажено, заборонені сторінки отримують None одразу в submit
+    (і при завантаженні – ті, що вже чекали в черзі), не займаючи
+    інтервалу delay хоста.
+
+    Хости, готові до наступного запиту, лежать у купі за часом, коли
+    запит дозволено, тож повільний або суворий хост не блокує потоки:
+    вони беруть сторінки інших хостів.
+
+    Якщо передано local, сторінка спершу шукається там (наприклад, у
+    свіжому дисковому кеші): знайдена сторінка віддається одразу, не
+    займаючи місця в черзі хоста і не чекаючи на delay, бо запиту до
+    сервера немає.
+    """
+
+    def __init__(self, fetch, workers: int = 8, per_host: int = 2, delay: float = 0.0,
+                 robots=None, user_agent: str = "*", local=None):
+        """
+        :param fetch: callable, функція url -> html | None.
+        :param workers: int, загальна кількість потоків завантаження.
+        :param per_host: int, максимум одночасних запитів до одного хоста.
+        :param delay: float, мінімальний інтервал між запитами до хоста (с).
+        :param robots: callable | None, функція (scheme, netloc) ->
+            urllib.robotparser.RobotFileParser | None; None – robots.txt не
+            перевіряється.
+        :param user_agent: str, агент, для якого перевіряються правила robots.txt.
+        :param local: callable | None, функція url -> html | None, що
+            повертає сторінку без запиту до мережі (None – сторінки немає).
+        """
+        self.fetch = fetch
+        self.local = local
+        self.per_host = max(1, per_host)
+        self.delay = delay
+        self.robots = robots
+        self.user_agent = user_agent
+        self._hosts = {}
+        self._ready = []
+        self._counter = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._threads = [threading.Thread(target=self._work, daemon=True)
+                         for _ in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+    def _schedule(self, host: tuple, state: _HostState):
+        """
+        Додає хост до купи готових, якщо в нього є сторінки та вільне місце.
+
+        Викликається під self._condition.
+        """
+        limit = self.per_host if self.robots is None or state.robots is not None else 1
+        if not state.scheduled and state.queue and state.active < limit:
+            state.scheduled = True
+            self._counter += 1
+            heapq.heappush(self._ready, (state.next_time, self._counter, host))
+            self._condition.notify()
+
+    def _disallowed(self, state: _HostState, url: str) -> bool:
+        """
+        Перевіряє, чи сторінку заборонено вже завантаженим robots.txt хоста.
+
+        :return: bool, True, якщо robots.txt відомий і забороняє url.
+        """
+        return bool(state.robots) and not state.robots.can_fetch(self.user_agent, url)
+
+    def submit(self, url: str) -> Future:
+        """
+        Ставить сторінку в чергу її хоста.
+
+        :param url: str, URL сторінки.
+        :return: concurrent.futures.Future, результат fetch(url).
+        """
+        future = Future()
+        if self.local is not None:
+            html = self.local(url)
+            if html is not None:
+                future.set_result(html)
+                return future
+        parts = urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Планувальник уже зупинено.")
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.delay)
+            if self._disallowed(state, url):
+                future.set_result(None)
+                return future
+            state.queue.append((url, future))
+            self._schedule(host, state)
+        return future
+
+    def map(self, urls: list[str]):
+        """
+        Завантажує сторінки і повертає результати в порядку urls.
+
+        Усі сторінки ставляться в черги одразу, тож поки чекаємо на
+        першу, інші вже завантажуються.
+
+        :param urls: list[str], URL сторінок.
+        :return: iterator[str | None], HTML сторінок (None при помилці).
+        """
+        futures = [self.submit(url) for url in urls]
+        for future in futures:
+            yield future.result()
+
+    def _take(self) -> tuple | None:
+        """
+        Чекає на хост, до якого вже можна надіслати запит, і бере з нього сторінку.
+
+        :return: tuple | None, (хост, стан, url, future) або None після shutdown.
+        """
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                if self._ready and self._ready[0][0] <= now:
+                    _, _, host = heapq.heappop(self._ready)
+                    state = self._hosts[host]
+                    state.scheduled = False
+                    if not state.queue:
+                        continue
+                    if state.next_time > now:
+                        self._schedule(host, state)
+                        continue
+                    url, future = state.queue.popleft()
+                    state.active += 1
+                    state.next_time = now + state.delay
+                    self._schedule(host, state)
+                    return host, state, url, future
+                self._condition.wait(self._ready[0][0] - now if self._ready else None)
+            return None
+
+    def _allowed(self, host: tuple, state: _HostState, url: str) -> bool:
+        """
+        Перевіряє robots.txt хоста, завантажуючи його під час першого запиту.
+
+        Перший запит до хоста виконується без паралельних (див. _schedule),
+        тож robots.txt завантажується рівно один раз.
+
+        :return: bool, True, якщо сторінку дозволено завантажувати.
+        """
+        if self.robots is None:
+            return True
+        if state.robots is None:
+            robots = self.robots(*host) or False
+            crawl_delay = robots and robots.crawl_delay(self.user_agent)
+            with self._condition:
+                if crawl_delay:
+                    state.delay = max(state.delay, float(crawl_delay))
+                    state.next_time = time.monotonic() + state.delay
+                state.robots = robots
+                if robots:
+                    waiting = state.queue
+                    state.queue = deque()
+                    for queued_url, future in waiting:
+                        if not self._disallowed(state, queued_url):
+                            state.queue.append((queued_url, future))
+                        elif future.set_running_or_notify_cancel():
+                            future.set_result(None)
+        return not state.robots or state.robots.can_fetch(self.user_agent, url)
+
+    def _work(self):
+        """Цикл потоку: бере сторінки готових хостів і завантажує їх."""
+        while (task := self._take()) is not None:
+            host, state, url, future = task
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = self.fetch(url) if self._allowed(host, state, url) else None
+                except Exception as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            with self._condition:
+                state.active -= 1
+                self._schedule(host, state)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Зупиняє потоки; сторінки, що ще чекають у чергах, скасовуються.
+
+        :param wait: bool, чи чекати завершення поточних завантажень.
+        """
+        with self._condition:
+            self._closed = True
+            for state in self._hosts.values():
+                for _, future in state.queue:
+                    future.cancel()
+                state.queue.clear()
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
@@ -0,0 +1,161 @@
+"""Інкрементне оновлення PageRank після повторного обходу"""
+
+import numpy as np
+
+from pagerank_engine import (DAMPING, MAX_ITERATIONS, TOLERANCE, build_transition_matrix,
+                             intern_vertexes, power_iteration)
+
+
+def apply_edge_changes(vertical_in: dict, vertical_out: dict, vertexes: set,
+                       added=(), removed=()) -> set[str]:
+    """
+    Додає та видаляє ребра у словниках графа на місці.
+
+    Вершини, які після видалення ребер лишились без сусідів, не
+    видаляються з vertexes – сторінка все одно існує.
+
+    :param vertical_in: dict[str, set[str]], словник вхідних ребер.
+    :param vertical_out: dict[str, set[str]], словник вихідних ребер.
+    :param vertexes: set[str], множина вершин графа.
+    :param added: iterable[tuple[str, str]], нові ребра (src, dst).
+    :param removed: iterable[tuple[str, str]], видалені ребра (src, dst).
+    :return: set[str], вершини, чий PageRank змінюється безпосередньо:
+        кінці змінених ребер та всі сусіди вершин, у яких змінилась
+        кількість вихідних ребер.
+    """
+    changed_sources = set()
+    affected = set()
+    for start_point, end_point in removed:
+        ends = vertical_out.get(start_point)
+        if ends is None or end_point not in ends:
+            continue
+        ends.discard(end_point)
+        if not ends:
+            del vertical_out[start_point]
+        starts = vertical_in[end_point]
+        starts.discard(start_point)
+        if not starts:
+            del vertical_in[end_point]
+        changed_sources.add(start_point)
+        affected.add(end_point)
+    for start_point, end_point in added:
+        vertical_out.setdefault(start_point, set()).add(end_point)
+        vertical_in.setdefault(end_point, set()).add(start_point)
+        vertexes.add(start_point)
+        vertexes.add(end_point)
+        changed_sources.add(start_point)
+        affected.add(end_point)
+    for start_point in changed_sources:
+        affected.update(vertical_out.get(start_point, ()))
+    affected |= changed_sources
+    return affected
+
+
+def _propagate_locally(matrix, dangling, rank, active, damping: float,
+                       tolerance: float, max_iterations: int) -> tuple[int, int]:
+    """
+    Перераховує PageRank лише для активних вершин, поширюючи зміни сусідам.
+
+    На кожному кроці нові значення рахуються тільки для активних вершин;
+    наступними активними стають вихідні сусіди тих вершин, чиє значення
+    змінилось більше ніж на tolerance / N. Сума "висячих" вершин
+    оновлюється на місці лише на зміну активних вершин, а не
+    перераховується по всіх N. Вектор rank змінюється на місці; його сума
+    після кроків може трохи відійти від 1, тож викликач його нормує.
+
+    :param matrix: scipy.sparse.csr_matrix, матриця переходів.
+    :param dangling: numpy.ndarray, булева маска "висячих" вершин.
+    :param rank: numpy.ndarray, поточний вектор PageRank.
+    :param active: numpy.ndarray, номери вершин, з яких починається поширення.
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності.
+    :param max_iterations: int, максимальна кількість кроків.
+    :return: tuple[int, int], кількість виконаних кроків та виконана
+        робота (кількість прочитаних елементів матриці плюс перерахованих
+        вершин) для порівняння з повними ітераціями.
+    """
+    size = matrix.shape[0]
+    base = (1 - damping) / size
+    out_edges = matrix.T.tocsr()
+    dangling_sum = rank[dangling].sum()
+    sweeps = 0
+    work = 0
+    while active.size and sweeps < max_iterations:
+        sweeps += 1
+        rows = matrix[active]
+        work += rows.nnz + active.size
+        new_values = base + damping * (rows @ rank + dangling_sum / size)
+        change = new_values - rank[active]
+        dangling_sum += change[dangling[active]].sum()
+        moved = active[np.abs(change) > tolerance / size]
+        rank[active] = new_values
+        active = np.unique(out_edges[moved].indices)
+    return sweeps, work
+
+
+def update_page_rank(page_rank: dict, vertical_in: dict, vertical_out: dict,
+                     vertexes: set, added=(), removed=(), local: bool = False,
+                     damping: float = DAMPING, tolerance: float = TOLERANCE,
+                     max_iterations: int = MAX_ITERATIONS,
+                     compare_cold_start: bool = True) -> tuple[dict, dict]:
+    """
+    Оновлює граф новою порцією ребер і перераховує PageRank з теплого старту.
+
+    Замість старту з 1/N степеневий метод починає з попередніх значень
+    page_rank (нові вершини отримують 1/N, вектор нормується до суми 1).
+    Якщо local=True, спершу зміни поширюються лише від зачеплених вершин
+    з точністю tolerance * 1000 (як наближення в host_rank.blockrank_start),
+    вектор нормується до суми 1, а потім кілька глобальних ітерацій
+    доводять його до збіжності (глобальні внески – телепортація та
+    "висячі" вершини – змінюються для всіх вершин одразу). Локальні кроки
+    теж мають ціну, тож у звіті вони перераховуються в еквівалент повних
+    ітерацій (local_work) і віднімаються від заощадженого. Виграш є лише
+    на графах з локальною структурою (посилання переважно всередині
+    сайтів); на випадкових графах зміни розходяться по всьому графу.
+
+    :param page_rank: dict[str, float], попередні значення PageRank.
+    :param vertical_in: dict[str, set[str]], словник вхідних ребер (змінюється).
+    :param vertical_out: dict[str, set[str]], словник вихідних ребер (змінюється).
+    :param vertexes: set[str], множина вершин графа (змінюється).
+    :param added: iterable[tuple[str, str]], нові ребра (src, dst).
+    :param removed: iterable[tuple[str, str]], видалені ребра (src, dst).
+    :param local: bool, чи поширювати зміни спершу лише від зачеплених вершин.
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності за L1-нормою.
+    :param max_iterations: int, максимальна кількість ітерацій.
+    :param compare_cold_start: bool, чи рахувати для порівняння холодний
+        старт з 1/N (подвоює вартість, потрібен лише для звіту).
+    :return: tuple[dict[str, float], dict], словник PageRank, відсортований
+        за спаданням, та звіт: iterations, local_sweeps, local_work
+        (локальні кроки в еквіваленті повних ітерацій), affected,
+        cold_iterations, iterations_saved = cold_iterations - iterations -
+        local_work (останні два – None без порівняння).
+    """
+    affected = apply_edge_changes(vertical_in, vertical_out, vertexes, added, removed)
+    report = {"iterations": 0, "local_sweeps": 0, "local_work": 0.0,
+              "affected": len(affected),
+              "cold_iterations": None, "iterations_saved": None}
+    if not vertexes:
+        return {}, report
+    urls, index = intern_vertexes(vertexes)
+    matrix, dangling = build_transition_matrix(vertical_out, index)
+    size = len(urls)
+    rank = np.array([page_rank.get(url, 1.0 / size) for url in urls])
+    rank /= rank.sum()
+    if local:
+        active = np.array(sorted(index[url] for url in affected), dtype=np.int64)
+        report["local_sweeps"], work = _propagate_locally(matrix, dangling, rank, active,
+                                                          damping, tolerance * 1000,
+                                                          max_iterations)
+        rank /= rank.sum()
+        report["local_work"] = work / (matrix.nnz + size)
+    rank, report["iterations"] = power_iteration(matrix, dangling, rank, damping,
+                                                 tolerance, max_iterations)
+    if compare_cold_start:
+        _, cold_iterations = power_iteration(matrix, dangling, None, damping,
+                                             tolerance, max_iterations)
+        report["cold_iterations"] = cold_iterations
+        report["iterations_saved"] = (cold_iterations - report["iterations"]
+                                      - report["local_work"])
+    order = np.argsort(-rank, kind="stable")
+    return {urls[i]: float(rank[i]) for i in order}, report
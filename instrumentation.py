@@ -0,0 +1,192 @@
+"""Таймери та лічильники етапів обходу і ранжування (майже безкоштовні, коли вимкнені)"""
+
+import cProfile
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+_ENABLED = False
+_LOCK = threading.Lock()
+_TIMERS = {}
+_COUNTERS = {}
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    """Контекстний менеджер, що додає тривалість блоку до таймера name."""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        add_time(self.name, time.perf_counter() - self.started)
+
+
+def enable(reset: bool = True):
+    """
+    Вмикає збирання таймерів і лічильників.
+
+    :param reset: bool, чи очистити раніше зібрані значення.
+    """
+    global _ENABLED
+    if reset:
+        with _LOCK:
+            _TIMERS.clear()
+            _COUNTERS.clear()
+    _ENABLED = True
+
+
+def disable():
+    """Вимикає збирання; зібрані значення лишаються доступними для summary."""
+    global _ENABLED
+    _ENABLED = False
+
+
+def is_enabled() -> bool:
+    """
+    Перевіряє, чи ввімкнено збирання.
+
+    :return: bool, True, якщо таймери й лічильники записуються.
+    """
+    return _ENABLED
+
+
+def timer(name: str):
+    """
+    Повертає контекстний менеджер, що вимірює час виконання блоку.
+
+    Коли збирання вимкнене, повертається один і той самий
+    nullcontext, тож ціна – виклик функції та перевірка прапорця.
+
+    :param name: str, назва таймера (наприклад, "fetch.request").
+    :return: контекстний менеджер.
+    """
+    if not _ENABLED:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def add_time(name: str, seconds: float):
+    """
+    Додає виміряний час до таймера (безпечно для потоків).
+
+    :param name: str, назва таймера.
+    :param seconds: float, тривалість у секундах.
+    """
+    with _LOCK:
+        entry = _TIMERS.get(name)
+        if entry is None:
+            entry = _TIMERS[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+
+
+def count(name: str, amount: int = 1):
+    """
+    Збільшує лічильник, якщо збирання ввімкнене.
+
+    :param name: str, назва лічильника (наприклад, "crawl.edges").
+    :param amount: int, на скільки збільшити.
+    """
+    if _ENABLED:
+        with _LOCK:
+            _COUNTERS[name] = _COUNTERS.get(name, 0) + amount
+
+
+def timed_iter(name: str, iterable):
+    """
+    Вимірює час очікування кожного наступного елемента ітератора.
+
+    Корисно для споживача, який чекає на результати з інших потоків
+    (наприклад, на завантажені сторінки). Коли збирання вимкнене,
+    ітератор повертається без обгортки.
+
+    :param name: str, назва таймера.
+    :param iterable: iterable, джерело елементів.
+    :return: iterator, ті самі елементи.
+    """
+    if not _ENABLED:
+        return iterable
+    return _timed_iter(name, iter(iterable))
+
+
+def _timed_iter(name: str, iterator):
+    """Генератор для timed_iter."""
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        add_time(name, time.perf_counter() - started)
+        yield item
+
+
+def summary() -> dict:
+    """
+    Повертає зібрані значення.
+
+    :return: dict, {"timers": {назва: {calls, seconds, mean_ms, max_ms}},
+        "counters": {назва: значення}}; таймери впорядковано за спаданням
+        сумарного часу.
+    """
+    with _LOCK:
+        timers = sorted(_TIMERS.items(), key=lambda item: item[1][1], reverse=True)
+        counters = dict(sorted(_COUNTERS.items()))
+    return {
+        "timers": {name: {"calls": calls, "seconds": round(seconds, 6),
+                          "mean_ms": round(seconds / calls * 1000, 4),
+                          "max_ms": round(longest * 1000, 4)}
+                   for name, (calls, seconds, longest) in timers},
+        "counters": counters,
+    }
+
+
+def write_summary(path: str):
+    """
+    Записує summary() у JSON-файл.
+
+    :param path: str, шлях до файлу.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(summary(), file, ensure_ascii=False, indent=2)
+
+
+@contextmanager
+def collect(stats_path: str | None = None, profile_path: str | None = None):
+    """
+    Збирає таймери (і, за бажанням, профіль cProfile) на час блоку.
+
+    Якщо обидва шляхи None, блок виконується без жодних вимірювань.
+    Профіль записується у форматі pstats (python -m pstats файл,
+    snakeviz тощо); cProfile бачить лише потік, у якому відкрито блок.
+
+    :param stats_path: str | None, JSON-файл для summary().
+    :param profile_path: str | None, файл для профілю cProfile.
+    """
+    if stats_path is None and profile_path is None:
+        yield
+        return
+    profiler = cProfile.Profile() if profile_path else None
+    enable()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        disable()
+        if stats_path is not None:
+            write_summary(stats_path)
@@ -0,0 +1,142 @@
+"""Витягування, фільтрація та нормалізація посилань зі сторінки за один прохід"""
+
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+HREF_PATTERN = re.compile(r'href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+SCHEME_PATTERN = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+ALLOWED_SCHEMES = frozenset({"http", "https"})
+SKIPPED_EXTENSIONS = frozenset({
+    "css", "js", "mjs", "json", "xml", "ico", "svg", "png", "jpg", "jpeg",
+    "gif", "webp", "bmp", "woff", "woff2", "ttf", "eot", "map",
+})
+SKIPPED_HOSTS = frozenset({"creativecommons.org"})
+UNSAFE_CHARACTERS = str.maketrans("", "", "\t\r\n")
+
+
+class LinkExtractor:
+    """
+    Витягує з HTML посилання для графа за один прохід по сторінці.
+
+    Для кожного href одразу виконуються:
+      фільтр за розширенням файлу в шляху URL (а не за підрядком
+      у всьому посиланні, як раніше: "/news/jpg-tips" не відкидається);
+      перевірка схеми (беруться лише http/https, а mailto:, javascript:
+      тощо відкидаються без urljoin);
+      перетворення на абсолютний URL та відкидання фрагмента (#...);
+      фільтр за хостом (і його піддоменами);
+      видалення повторів у межах сторінки.
+    """
+
+    def __init__(self, skipped_extensions=SKIPPED_EXTENSIONS,
+                 skipped_hosts=SKIPPED_HOSTS, allowed_schemes=ALLOWED_SCHEMES):
+        self.skipped_extensions = frozenset(ext.lower().lstrip(".")
+                                            for ext in skipped_extensions)
+        self.skipped_hosts = frozenset(host.lower() for host in skipped_hosts)
+        self.allowed_schemes = frozenset(scheme.lower() for scheme in allowed_schemes)
+
+    def _is_skipped_host(self, host: str) -> bool:
+        """
+        Перевіряє, чи належить хост (або його батьківський домен) до відкинутих.
+
+        :param host: str, хост у нижньому регістрі.
+        :return: bool, True, якщо посилання треба пропустити.
+        """
+        while host:
+            if host in self.skipped_hosts:
+                return True
+            _, _, host = host.partition(".")
+        return False
+
+    def _is_skipped_path(self, href: str) -> bool:
+        """
+        Перевіряє розширення файлу в шляху посилання (без query та фрагмента).
+
+        :param href: str, посилання (абсолютне або відносне).
+        :return: bool, True, якщо розширення входить до відкинутих.
+        """
+        path = href.partition("#")[0].partition("?")[0]
+        last_segment = path.rpartition("/")[2]
+        if "." not in last_segment:
+            return False
+        return last_segment.rpartition(".")[2].lower() in self.skipped_extensions
+
+    def normalize(self, base_url: str, href: str, origin: str | None = None) -> str | None:
+        """
+        Перетворює href на абсолютний URL або відкидає його.
+
+        Фільтри схеми та розширення застосовуються до самого href, тому
+        відкинуті посилання не проходять через urljoin. Табуляції та
+        переведення рядка видаляються з усього href (як це робить
+        urlsplit), інакше вони потрапили б у файл ребер. Посилання від
+        кореня сайту ("/path") без сегментів "." і ".." приєднуються до
+        origin без urljoin, в абсолютних посиланнях ці сегменти
+        розкриваються так само, як у відносних.
+
+        :param base_url: str, адреса сторінки, на якій знайдено посилання.
+        :param href: str, значення атрибута href.
+        :param origin: str | None, "схема://хост" сторінки (обчислюється,
+            якщо не передано).
+        :return: str | None, абсолютний URL без фрагмента або None,
+            якщо посилання не проходить фільтри.
+        """
+        href = href.strip().translate(UNSAFE_CHARACTERS)
+        if not href or self._is_skipped_path(href):
+            return None
+        scheme = SCHEME_PATTERN.match(href)
+        if scheme is not None:
+            if scheme.group(1).lower() not in self.allowed_schemes:
+                return None
+            full_url = href
+        elif (href[0] == "/" and href[1:2] != "/" and "/." not in href
+              and not href.partition("#")[0].endswith("?")):
+            if origin is None:
+                parts = urlsplit(base_url)
+                origin = f"{parts.scheme}://{parts.netloc}"
+            return origin + href.partition("#")[0]
+        else:
+            full_url = urljoin(base_url, href)
+        full_url = full_url.partition("#")[0]
+        parts = urlsplit(full_url)
+        if parts.scheme.lower() not in self.allowed_schemes or not parts.netloc:
+            return None
+        if self.skipped_hosts and self._is_skipped_host((parts.hostname or "").lower()):
+            return None
+        if "/." in parts.path:
+            parts = parts._replace(path=urlsplit(urljoin(full_url, parts.path)).path)
+        return urlunsplit(parts)
+
+    def extract(self, base_url: str, html: str, max_links: int | None = None) -> list[str]:
+        """
+        Знаходить у HTML унікальні посилання, які треба записати як ребра графа.
+
+        :param base_url: str, адреса сторінки, з якої взято HTML.
+        :param html: str, вміст сторінки.
+        :param max_links: int | None, максимальна кількість посилань
+            (None – без обмеження).
+        :return: list[str], унікальні абсолютні URL у порядку появи на сторінці.
+        """
+        base_parts = urlsplit(base_url)
+        if base_parts.scheme.lower() not in self.allowed_schemes or not base_parts.netloc:
+            return []
+        if (self.skipped_hosts and
+                self._is_skipped_host((base_parts.hostname or "").lower())):
+            return []
+        origin = f"{base_parts.scheme}://{base_parts.netloc}"
+        links = []
+        seen_hrefs = set()
+        seen_urls = set()
+        normalize = self.normalize
+        for match in HREF_PATTERN.finditer(html):
+            href = match.group(1)
+            if href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
+            full_url = normalize(base_url, href, origin)
+            if full_url is None or full_url in seen_urls:
+                continue
+            seen_urls.add(full_url)
+            links.append(full_url)
+            if max_links is not None and len(links) >= max_links:
+                break
+        return links
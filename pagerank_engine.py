@@ -0,0 +1,179 @@
+"""Векторизований PageRank на розріджених матрицях (NumPy + SciPy)"""
+
+import numpy as np
+from scipy import sparse
+
+from instrumentation import count, timer
+from ranking import top_k_indices
+
+DAMPING = 0.85
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 1000
+
+
+def intern_vertexes(vertexes) -> tuple[list[str], dict[str, int]]:
+    """
+    Присвоює кожній вершині (URL) цілий номер.
+
+    Вершини сортуються, тож однаковий набір URL завжди отримує
+    однакові номери.
+
+    :param vertexes: iterable[str], множина вершин графа.
+    :return: tuple[list[str], dict[str, int]], список URL за номером
+        та словник {URL: номер}.
+    """
+    urls = sorted(vertexes)
+    index = {url: i for i, url in enumerate(urls)}
+    return urls, index
+
+
+def build_transition_matrix(out_in_ribs: dict, index: dict[str, int]) -> tuple:
+    """
+    Будує розріджену матрицю переходів M у форматі CSR.
+
+    M[j, i] = 1 / L(i), якщо є ребро i -> j, де L(i) – кількість
+    вихідних ребер вершини i. Тоді внесок сусідів для всіх вершин
+    одночасно – це добуток M @ PR.
+
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер.
+    :param index: dict[str, int], словник {URL: номер}.
+    :return: tuple[scipy.sparse.csr_matrix, numpy.ndarray], матриця
+        переходів та булева маска "висячих" вершин (без вихідних ребер).
+    """
+    size = len(index)
+    sources = []
+    targets = []
+    for start, ends in out_in_ribs.items():
+        src = index[start]
+        for end in ends:
+            sources.append(src)
+            targets.append(index[end])
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    out_degree = np.bincount(sources, minlength=size).astype(np.float64)
+    dangling = out_degree == 0
+    weights = 1.0 / out_degree[sources]
+    matrix = sparse.csr_matrix((weights, (targets, sources)), shape=(size, size))
+    return matrix, dangling
+
+
+def transition_matrix_from_csr(row_offsets, targets) -> tuple:
+    """
+    Будує матрицю переходів з CSR-масивів вихідних ребер.
+
+    CSR вихідних ребер (рядок = початок ребра) – це той самий набір
+    масивів, що й CSC матриці переходів M (стовпець = початок ребра),
+    тому indptr та indices беруться прямо з буферів (наприклад,
+    memoryview над mmap-файлом BinaryGraph) без розбору та сортування.
+    Якщо буфери вже в типі індексів scipy (обидва int32 або int64, як у
+    файлах graph_io.write_binary_graph), матриця використовує їх без
+    копіювання; нові масиви – лише ваги ребер і маска "висячих" вершин.
+    Буфери інших типів (наприклад, uint64/uint32 старих файлів) scipy
+    перетворює з копіюванням.
+
+    :param row_offsets: buffer, зсуви рядків (int32/int64).
+    :param targets: buffer, кінці ребер (того самого типу).
+    :return: tuple[scipy.sparse.csc_matrix, numpy.ndarray], матриця
+        переходів та булева маска "висячих" вершин.
+    """
+    indptr = np.asarray(row_offsets)
+    indices = np.asarray(targets)
+    size = len(indptr) - 1
+    out_degree = np.diff(indptr).astype(np.float64)
+    dangling = out_degree == 0
+    with np.errstate(divide="ignore"):
+        weights = np.repeat(1.0 / out_degree, out_degree.astype(np.int64))
+    matrix = sparse.csc_matrix((weights, indices, indptr), shape=(size, size), copy=False)
+    return matrix, dangling
+
+
+def power_iteration(matrix, dangling, rank=None, damping: float = DAMPING,
+                    tolerance: float = TOLERANCE,
+                    max_iterations: int = MAX_ITERATIONS) -> tuple:
+    """
+    Степеневий метод для PageRank на розрідженій матриці.
+
+    На кожній ітерації:
+        PR' = (1 - d) / N + d * (M @ PR + S / N),
+    де S – сума PageRank "висячих" вершин. Ітерації тривають, доки
+    L1-норма різниці між сусідніми векторами не стане меншою за tolerance.
+
+    :param matrix: scipy.sparse.csr_matrix, матриця переходів.
+    :param dangling: numpy.ndarray, булева маска "висячих" вершин.
+    :param rank: numpy.ndarray | None, початковий вектор (за замовчуванням 1/N).
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності за L1-нормою.
+    :param max_iterations: int, максимальна кількість ітерацій.
+    :return: tuple[numpy.ndarray, int], вектор PageRank та кількість ітерацій.
+    """
+    size = matrix.shape[0]
+    if rank is None:
+        rank = np.full(size, 1.0 / size)
+    base = (1 - damping) / size
+    iterations = 0
+    while iterations < max_iterations:
+        iterations += 1
+        with timer("rank.iteration"):
+            dangling_sum = rank[dangling].sum()
+            new_rank = base + damping * (matrix @ rank + dangling_sum / size)
+            delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tolerance:
+            break
+    count("rank.iterations", iterations)
+    return rank, iterations
+
+
+def sparse_page_rank(page_rank, out_in_ribs, in_out_ribs, peaks, useless_peaks,
+                     sort_result: bool = True):
+    """
+    Обчислює PageRank так само, як get_page_rank, але матричними операціями.
+
+    URL перетворюються на цілі номери, матриця переходів будується
+    один раз, а кожна ітерація – це одне множення розрідженої матриці
+    на вектор. Початкові значення беруться з page_rank.
+
+    :param page_rank: dict[str, float], початковий словник PageRank.
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер.
+    :param in_out_ribs: dict[str, set[str]], словник вхідних ребер
+        (не потрібен для побудови матриці, залишено для сумісності).
+    :param peaks: set[str], множина вершин графа.
+    :param useless_peaks: set[str], множина не потрібних вершин.
+    :param sort_result: bool, чи сортувати результат.
+    :return: dict[str, float], словник PageRank-значень, відсортований
+        за спаданням значення (якщо sort_result).
+    """
+    if not peaks:
+        return {}
+    with timer("rank.matrix"):
+        urls, index = intern_vertexes(peaks | useless_peaks)
+        matrix, dangling = build_transition_matrix(out_in_ribs, index)
+    start = np.array([page_rank.get(url, 1.0 / len(urls)) for url in urls])
+    rank, _ = power_iteration(matrix, dangling, start)
+    if not sort_result:
+        return dict(zip(urls, rank.tolist()))
+    order = np.argsort(-rank, kind="stable")
+    return {urls[i]: float(rank[i]) for i in order}
+
+
+def binary_page_rank(graph, top: int | None = None) -> dict:
+    """
+    Обчислює PageRank для графа, відкритого через graph_io.BinaryGraph.
+
+    Якщо задано top, декодуються URL лише top найкращих вершин
+    (ranking.top_k_indices), а не вся таблиця рядків.
+
+    :param graph: graph_io.BinaryGraph, граф у бінарному форматі.
+    :param top: int | None, скільки найкращих вершин повернути (None – усі).
+    :return: dict[str, float], словник PageRank-значень, відсортований
+        за спаданням значення.
+    """
+    if not graph.num_vertexes:
+        return {}
+    matrix, dangling = transition_matrix_from_csr(graph.row_offsets, graph.targets)
+    rank, _ = power_iteration(matrix, dangling)
+    if top is None:
+        order = np.argsort(-rank, kind="stable")
+    else:
+        order = top_k_indices(rank, top)
+    return {graph.url(int(i)): float(rank[i]) for i in order}
@@ -0,0 +1,282 @@
+"""Різні ітераційні методи PageRank зі звітом про збіжність"""
+
+import time
+from collections import deque
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from instrumentation import add_time, count, is_enabled
+from pagerank_engine import (DAMPING, MAX_ITERATIONS, TOLERANCE, build_transition_matrix,
+                             intern_vertexes)
+
+SOLVERS = ("jacobi", "gauss_seidel", "adaptive")
+NORMS = {
+    "l1": lambda diff: float(np.abs(diff).sum()),
+    "l2": lambda diff: float(np.sqrt(np.dot(diff, diff))),
+    "max": lambda diff: float(np.abs(diff).max()) if diff.size else 0.0,
+}
+
+
+def _quadratic_extrapolation(history):
+    """
+    Квадратична екстраполяція (Kamvar et al., "Extrapolation Methods for
+    Accelerating PageRank Computations") за чотирма послідовними векторами.
+
+    Поточний вектор вважається сумою трьох головних власних векторів;
+    коефіцієнти мінімального многочлена знаходяться методом найменших
+    квадратів за різницями з найстарішим вектором, а його внесок
+    (другий і третій власні вектори) віднімається. Від'ємні значення
+    обрізаються, результат нормується до суми 1.
+
+    :param history: sequence[numpy.ndarray], вектори x(k-3), x(k-2),
+        x(k-1), x(k).
+    :return: numpy.ndarray, екстрапольований вектор.
+    """
+    oldest, older, previous, current = history
+    differences = np.column_stack((older - oldest, previous - oldest))
+    gamma, *_ = np.linalg.lstsq(differences, -(current - oldest), rcond=None)
+    beta_1 = gamma[1] + 1.0
+    beta_0 = gamma[0] + beta_1
+    result = beta_0 * older + beta_1 * previous + current
+    np.maximum(result, 0, out=result)
+    return result / result.sum()
+
+
+def _ratio_settled(residuals, spread: float = 0.01) -> bool:
+    """
+    Перевіряє, чи стабілізувалась швидкість збіжності.
+
+    Екстраполяція має сенс лише тоді, коли похибка вже визначається
+    кількома головними власними векторами, тобто відношення сусідніх
+    змін r(k) / r(k-1) майже не змінюється.
+
+    :param residuals: list[float], зміни на кожній ітерації.
+    :param spread: float, допустима відносна різниця двох відношень.
+    :return: bool, True, якщо два останні відношення відрізняються менше
+        ніж на spread.
+    """
+    if len(residuals) < 3 or not residuals[-2] or not residuals[-3]:
+        return False
+    ratio = residuals[-1] / residuals[-2]
+    return abs(ratio - residuals[-2] / residuals[-3]) < spread * ratio
+
+
+def _jacobi(matrix, dangling, rank, damping, tolerance, max_iterations, measure,
+            residuals, extrapolate_every: int = 0):
+    """
+    Метод Якобі (степеневий метод) з необов'язковою квадратичною екстраполяцією.
+
+    Екстраполяція (_quadratic_extrapolation) застосовується не частіше
+    ніж раз на extrapolate_every ітерацій і лише тоді, коли відношення
+    сусідніх змін стабілізувалось (_ratio_settled); після неї потрібні
+    чотири нові вектори.
+
+    Параметри – як у solve_page_rank; measure – функція норми, а до
+    списку residuals додається зміна на кожній ітерації.
+
+    :return: numpy.ndarray, вектор PageRank.
+    """
+    size = matrix.shape[0]
+    base = (1 - damping) / size
+    history = deque(maxlen=4)
+    last_extrapolation = 0
+    while len(residuals) < max_iterations:
+        new_rank = base + damping * (matrix @ rank + rank[dangling].sum() / size)
+        residuals.append(measure(new_rank - rank))
+        rank = new_rank
+        if residuals[-1] < tolerance:
+            break
+        if extrapolate_every:
+            history.append(rank)
+            if (len(history) == 4 and len(residuals) - last_extrapolation >= extrapolate_every
+                    and _ratio_settled(residuals)):
+                rank = _quadratic_extrapolation(history)
+                history.clear()
+                last_extrapolation = len(residuals)
+    return rank
+
+
+def _gauss_seidel(matrix, dangling, rank, damping, tolerance, max_iterations, measure,
+                  residuals):
+    """
+    Метод Гаусса–Зейделя: нові значення одразу використовуються в тій самій ітерації.
+
+    Ітерація записується як (I - d * L) x' = (1 - d) / N + d * (U x + S / N),
+    де L – нижній трикутник матриці переходів (з діагоналлю), U – решта.
+    Трикутна матриця розкладається один раз (splu без перестановок),
+    тож кожна ітерація – це одне множення та одна пряма підстановка.
+    Сума "висячих" вершин S береться з попередньої ітерації, а вектор
+    після кожної ітерації нормується до суми 1.
+
+    Параметри – як у _jacobi.
+
+    :return: numpy.ndarray, вектор PageRank.
+    """
+    size = matrix.shape[0]
+    base = (1 - damping) / size
+    lower = sparse.tril(matrix, format="csc")
+    upper = sparse.triu(matrix, k=1, format="csr")
+    system = (sparse.identity(size, format="csc") - damping * lower).tocsc()
+    solver = splu(system, permc_spec="NATURAL", diag_pivot_thresh=0,
+                  options={"SymmetricMode": True})
+    while len(residuals) < max_iterations:
+        right = base + damping * (upper @ rank + rank[dangling].sum() / size)
+        new_rank = solver.solve(right)
+        new_rank /= new_rank.sum()
+        residuals.append(measure(new_rank - rank))
+        rank = new_rank
+        if residuals[-1] < tolerance:
+            break
+    return rank
+
+
+def _adaptive(matrix, dangling, rank, damping, tolerance, max_iterations, measure,
+              residuals):
+    """
+    Адаптивний PageRank: вершини, що вже зійшлися, більше не перераховуються.
+
+    Вершина "заморожується", коли її зміна за ітерацію менша за
+    tolerance / N; рядки матриці для решти вершин вибираються заново
+    лише тоді, коли набір активних вершин зменшився хоча б на 10%. Заморожені вершини
+    все ж трохи змінюються через телепортацію та "висячі" вершини,
+    тому наприкінці виконуються звичайні ітерації Якобі, доки повна
+    зміна не стане меншою за tolerance.
+
+    Параметри – як у _jacobi.
+
+    :return: numpy.ndarray, вектор PageRank.
+    """
+    size = matrix.shape[0]
+    base = (1 - damping) / size
+    rank = rank.copy()
+    active = np.arange(size)
+    rows = matrix
+    while active.size and len(residuals) < max_iterations:
+        new_values = base + damping * (rows @ rank + rank[dangling].sum() / size)
+        diff = new_values - rank[active]
+        rank[active] = new_values
+        residuals.append(measure(diff))
+        if residuals[-1] < tolerance:
+            break
+        moving = np.abs(diff) >= tolerance / size
+        if moving.sum() < 0.9 * active.size:
+            active = active[moving]
+            rows = matrix[active]
+    return _jacobi(matrix, dangling, rank, damping, tolerance, max_iterations, measure,
+                   residuals)
+
+
+def solve_page_rank(matrix, dangling, solver: str = "jacobi", rank=None,
+                    damping: float = DAMPING, tolerance: float = TOLERANCE,
+                    max_iterations: int = MAX_ITERATIONS, norm: str = "l1",
+                    extrapolate_every: int = 0) -> tuple:
+    """
+    Обчислює PageRank вибраним методом і повертає звіт про збіжність.
+
+    Методи:
+      "jacobi" – степеневий метод (як power_iteration); з extrapolate_every > 0
+      не частіше ніж раз на extrapolate_every ітерацій застосовується квадратична
+      екстраполяція (лише коли швидкість збіжності стабілізувалась);
+      "gauss_seidel" – метод Гаусса–Зейделя, зазвичай потребує менше ітерацій;
+      "adaptive" – адаптивний PageRank, що не перераховує вершини, які вже
+      зійшлися.
+
+    :param matrix: scipy.sparse.csr_matrix, матриця переходів.
+    :param dangling: numpy.ndarray, булева маска "висячих" вершин.
+    :param solver: str, назва методу з SOLVERS.
+    :param rank: numpy.ndarray | None, початковий вектор (за замовчуванням 1/N).
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності.
+    :param max_iterations: int, максимальна кількість ітерацій.
+    :param norm: str, норма зміни між ітераціями ("l1", "l2" або "max").
+    :param extrapolate_every: int, період екстраполяції для "jacobi" (0 – вимкнено).
+    :return: tuple[numpy.ndarray, dict], вектор PageRank і звіт: solver,
+        iterations, residuals (зміна на кожній ітерації), seconds, converged.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Невідомий метод PageRank: {solver}")
+    if norm not in NORMS:
+        raise ValueError(f"Невідома норма: {norm}")
+    matrix = sparse.csr_matrix(matrix)
+    size = matrix.shape[0]
+    if rank is None:
+        rank = np.full(size, 1.0 / size)
+    residuals = []
+    started = time.perf_counter()
+    if solver == "jacobi":
+        rank = _jacobi(matrix, dangling, rank, damping, tolerance, max_iterations,
+                       NORMS[norm], residuals, extrapolate_every)
+    elif solver == "gauss_seidel":
+        rank = _gauss_seidel(matrix, dangling, rank, damping, tolerance, max_iterations,
+                             NORMS[norm], residuals)
+    else:
+        rank = _adaptive(matrix, dangling, rank, damping, tolerance, max_iterations,
+                         NORMS[norm], residuals)
+    report = {
+        "solver": solver,
+        "iterations": len(residuals),
+        "residuals": residuals,
+        "seconds": time.perf_counter() - started,
+        "converged": bool(residuals) and residuals[-1] < tolerance,
+    }
+    return rank, report
+
+
+def format_report(report: dict) -> list[str]:
+    """
+    Перетворює звіт solve_page_rank на рядки для логу.
+
+    :param report: dict, звіт solve_page_rank.
+    :return: list[str], підсумок (метод, ітерації, час, збіжність) і
+        зміни на кожній ітерації.
+    """
+    status = "зійшовся" if report["converged"] else "не зійшовся"
+    lines = [f"Метод {report['solver']}: {report['iterations']} ітерацій, "
+             f"{report['seconds']:.3f} с, {status}"]
+    for iteration, residual in enumerate(report["residuals"], 1):
+        lines.append(f"  ітерація {iteration:>3}: зміна {residual:.3e}")
+    return lines
+
+
+def solver_page_rank(page_rank, out_in_ribs, in_out_ribs, peaks, useless_peaks,
+                     sort_result: bool = True, solver: str = "gauss_seidel", log=None,
+                     **options):
+    """
+    Обчислює PageRank з тими ж аргументами, що й get_page_rank, вибраним методом.
+
+    Звіт про збіжність передається в log (format_report), а кількість
+    ітерацій і час – у лічильник rank.iterations і таймер rank.solve
+    (instrumentation).
+
+    :param page_rank: dict[str, float], початковий словник PageRank.
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер.
+    :param in_out_ribs: dict[str, set[str]], словник вхідних ребер
+        (не потрібен для побудови матриці, залишено для сумісності).
+    :param peaks: set[str], множина вершин графа.
+    :param useless_peaks: set[str], множина не потрібних вершин.
+    :param sort_result: bool, чи сортувати результат.
+    :param solver: str, назва методу з SOLVERS.
+    :param log: callable | None, функція для виводу звіту про збіжність.
+    :param options: інші параметри solve_page_rank (damping, tolerance,
+        max_iterations, norm, extrapolate_every).
+    :return: dict[str, float], словник PageRank-значень, відсортований
+        за спаданням значення (якщо sort_result).
+    """
+    if not peaks:
+        return {}
+    urls, index = intern_vertexes(peaks | useless_peaks)
+    matrix, dangling = build_transition_matrix(out_in_ribs, index)
+    start = np.array([page_rank.get(url, 1.0 / len(urls)) for url in urls])
+    rank, report = solve_page_rank(matrix, dangling, solver, start, **options)
+    if is_enabled():
+        count("rank.iterations", report["iterations"])
+        add_time("rank.solve", report["seconds"])
+    if log is not None:
+        for line in format_report(report):
+            log(line)
+    if not sort_result:
+        return dict(zip(urls, rank.tolist()))
+    order = np.argsort(-rank, kind="stable")
+    return {urls[i]: float(rank[i]) for i in order}
@@ -0,0 +1,139 @@
+"""Персоналізований PageRank: багато векторів телепортації за один прохід"""
+
+from urllib.parse import urlsplit
+
+import numpy as np
+from scipy import sparse
+
+from pagerank_engine import (DAMPING, MAX_ITERATIONS, TOLERANCE, build_transition_matrix,
+                             intern_vertexes)
+from ranking import top_k_indices
+
+
+def host_seeds(urls) -> dict[str, set[str]]:
+    """
+    Групує URL за хостами: кожен хост дає окремий набір стартових вершин.
+
+    :param urls: iterable[str], URL вершин графа.
+    :return: dict[str, set[str]], словник {хост: множина його URL}.
+    """
+    seeds = {}
+    for url in urls:
+        seeds.setdefault(urlsplit(url).netloc, set()).add(url)
+    return seeds
+
+
+def teleport_matrix(seed_sets: list, index: dict[str, int]):
+    """
+    Будує розріджену матрицю векторів телепортації N × k.
+
+    Стовпець j рівномірно розподілений по вершинах seed_sets[j]
+    (сума стовпця дорівнює 1).
+
+    :param seed_sets: list[iterable[str]], набори стартових URL.
+    :param index: dict[str, int], словник {URL: номер}.
+    :return: scipy.sparse.csc_matrix, матриця N × k.
+    :raises ValueError: якщо якийсь набір не містить жодної вершини графа.
+    """
+    rows, columns, values = [], [], []
+    for column, seeds in enumerate(seed_sets):
+        seed_rows = sorted({index[url] for url in seeds if url in index})
+        if not seed_rows:
+            raise ValueError(f"Набір стартових вершин №{column} не містить вершин графа.")
+        rows.extend(seed_rows)
+        columns.extend([column] * len(seed_rows))
+        values.extend([1.0 / len(seed_rows)] * len(seed_rows))
+    return sparse.csc_matrix((values, (rows, columns)), shape=(len(index), len(seed_sets)))
+
+
+def batched_power_iteration(matrix, dangling, teleport, damping: float = DAMPING,
+                            tolerance: float = TOLERANCE,
+                            max_iterations: int = MAX_ITERATIONS) -> tuple:
+    """
+    Степеневий метод одразу для k векторів телепортації.
+
+    Для кожного стовпця v ітерація має вигляд
+        PR' = d * M @ PR + (1 - d + d * S) * v,
+    де S – сума PageRank "висячих" вершин цього стовпця (перехід з
+    "висячої" вершини теж веде у v). Усі стовпці множаться на матрицю
+    переходів разом (розріджена матриця × щільна N × k), тож матриця
+    читається з пам'яті один раз на ітерацію, а не k разів. Вектори
+    телепортації розріджені, тому додаються лише в їхніх ненульових
+    позиціях, а різниця між ітераціями рахується на місці старого
+    вектора. Стовпці, L1-зміна яких стала меншою за tolerance, далі не
+    перераховуються.
+
+    :param matrix: scipy.sparse.csr_matrix, матриця переходів.
+    :param dangling: numpy.ndarray, булева маска "висячих" вершин.
+    :param teleport: scipy.sparse матриця або numpy.ndarray N × k
+        (стовпці з сумою 1).
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності за L1-нормою.
+    :param max_iterations: int, максимальна кількість ітерацій.
+    :return: tuple[numpy.ndarray, numpy.ndarray], матриця PageRank N × k
+        та кількість ітерацій для кожного стовпця.
+    """
+    teleport = sparse.csc_matrix(teleport)
+    dangling_rows = np.flatnonzero(dangling)
+    ranks = np.empty(teleport.shape)
+    iterations = np.zeros(teleport.shape[1], dtype=np.int64)
+    active = np.arange(teleport.shape[1])
+    rank = teleport.toarray()
+    vectors = teleport.tocoo()
+    while active.size and iterations[active[0]] < max_iterations:
+        iterations[active] += 1
+        coefficients = 1 - damping + damping * rank[dangling_rows].sum(axis=0)
+        new_rank = matrix @ rank
+        new_rank *= damping
+        new_rank[vectors.row, vectors.col] += coefficients[vectors.col] * vectors.data
+        np.subtract(new_rank, rank, out=rank)
+        np.abs(rank, out=rank)
+        moving = rank.sum(axis=0) >= tolerance
+        rank = new_rank
+        if not moving.all():
+            ranks[:, active[~moving]] = rank[:, ~moving]
+            active = active[moving]
+            rank = np.ascontiguousarray(rank[:, moving])
+            vectors = teleport[:, active].tocoo()
+    ranks[:, active] = rank
+    return ranks, iterations
+
+
+def personalized_page_rank(out_in_ribs, peaks, useless_peaks, seeds: dict, k: int = 10,
+                           block_size: int = 16, **options) -> dict[str, list[tuple]]:
+    """
+    Обчислює персоналізований PageRank для кількох наборів стартових вершин.
+
+    Матриця переходів будується один раз, а набори рахуються блоками по
+    block_size стовпців (batched_power_iteration), тож у пам'яті
+    одночасно лише кілька матриць N × block_size, скільки б наборів не
+    було. Для кожного набору зберігається лише k найкращих вершин
+    (ranking.top_k_indices).
+
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер.
+    :param peaks: set[str], множина вершин графа.
+    :param useless_peaks: set[str], множина не потрібних вершин.
+    :param seeds: dict[str, iterable[str]], словник {назва: стартові URL},
+        наприклад {url: {url}} для кожної стартової сторінки або
+        host_seeds(peaks) для кожного хоста.
+    :param k: int, кількість найкращих вершин для кожного набору.
+    :param block_size: int, скільки наборів рахувати одночасно.
+    :param options: параметри batched_power_iteration (damping,
+        tolerance, max_iterations).
+    :return: dict[str, list[tuple[str, float]]], словник {назва: пари
+        (URL, PageRank) за спаданням}.
+    """
+    if not peaks or not seeds:
+        return {}
+    urls, index = intern_vertexes(peaks | useless_peaks)
+    matrix, dangling = build_transition_matrix(out_in_ribs, index)
+    names = list(seeds)
+    teleport = teleport_matrix([seeds[name] for name in names], index)
+    result = {}
+    for start in range(0, len(names), block_size):
+        ranks, _ = batched_power_iteration(matrix, dangling,
+                                           teleport[:, start:start + block_size], **options)
+        for column, name in enumerate(names[start:start + block_size]):
+            scores = ranks[:, column]
+            result[name] = [(urls[i], float(scores[i])) for i in top_k_indices(scores, k)]
+    return result
@@ -0,0 +1,303 @@
+"""Обхід сайтів, побудова графа та PageRank без GUI (без PyQt5 і matplotlib)"""
+
+from functools import partial
+
+from graph_io import read_graph
+from instrumentation import collect, count, timer
+from ranking import top_k_items
+
+
+def read_file(file_name: str) -> list[str]:
+    """
+    Зчитує текстовий файл з описом графа посилань.
+
+    Кожен рядок файлу має формат:
+        url -> url
+
+    :param file_name: str, шлях до файлу (наприклад, "menu.dot").
+    :return: list[str], список рядків файлу без додаткової обробки.
+    """
+    with open(file_name, 'r', encoding='utf-8') as file:
+        file_con = file.readlines()
+    return file_con
+
+def create_dictionaries(file_content: list[str]) -> tuple:
+    """
+    Створює словники структури графа за вмістом файлу.
+
+    Зі списку рядків формату "src -> dst" будує:
+      vertical_in – словник {вершина: множина вхідних сусідів};
+      vertical_out – словник {вершина: множина вихідних сусідів};
+      page_rank – словник початкових значень PageRank;
+      vertexes – множина всіх вершин, які зустрілися в ребрах;
+      not_used_vertexes – множина вершин без ребер.
+
+    :param file_content: list[str], список рядків файлу з ребрами графа.
+    :return: tuple[dict, dict, dict, set, set], кортеж 
+    (vertical_in, vertical_out, page_rank, vertexes, not_used_vertexes).
+    """
+    with timer("graph.build"):
+        vertical_out = {}
+        vertical_in = {}
+        page_rank = {}
+        vertexes = set()
+        not_used_vertexes = set()
+        for elem in file_content:
+            elem = elem.strip()
+            if not elem:
+                continue
+            if '->' not in elem:
+                continue
+            start_point, end_point = elem.split('->', 1)
+            start_point = start_point.strip()
+            end_point = end_point.strip()
+            if not start_point or not end_point:
+                continue
+            vertical_out.setdefault(start_point, set()).add(end_point)
+            vertical_in.setdefault(end_point, set()).add(start_point)
+            vertexes.add(start_point)
+            vertexes.add(end_point)
+        if not vertexes:
+            return vertical_in, vertical_out, {}, vertexes, not_used_vertexes
+        page_rank = dict.fromkeys(vertexes, 1 / len(vertexes))
+        page_rank = dict(sorted(page_rank.items(), key=lambda x: x[0]))
+        return vertical_in, vertical_out, page_rank, vertexes, not_used_vertexes
+
+def get_page_rank(page_rank, out_in_ribs, in_out_ribs, peaks, useless_peaks,
+                  sort_result: bool = True, damping: float = 0.85,
+                  tolerance: float = 1e-6):
+    """
+    Обчислює значення PageRank для заданого орієнтованого графа.
+
+    Використовується класична ітеративна формула PageRank:
+        PR(v) = (1 - d) / N + d * (сума по всіх u, які ведуть у v) +
+        внесок "висячих" вершин.
+
+    Ітерації тривають, доки зміни PR для всіх вершин не стануть
+    меншими за tolerance (за замовчуванням 1e-6). Інші методи
+    (Гаусса–Зейделя, адаптивний, з екстраполяцією) – у pagerank_solvers.
+
+    :param page_rank: dict[str, float], початковий словник PageRank.
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер
+        {вершина: множина сусідів, куди є ребро}.
+    :param in_out_ribs: dict[str, set[str]], словник вхідних ребер
+        {вершина: множина вершин, звідки є ребро}.
+    :param peaks: set[str], множина вершин графа.
+    :param useless_peaks: set[str], множина не потрібних вершин.
+    :param sort_result: bool, чи сортувати результат. Якщо потрібні лише
+        кілька найкращих сторінок, дешевше передати False і скористатися
+        ranking.top_k_items.
+    :param damping: float, коефіцієнт згасання d.
+    :param tolerance: float, поріг зміни PR для кожної вершини.
+    :return: dict[str, float], словник PageRank-значень, відсортований
+        за спаданням значення (якщо sort_result).
+    """
+    if not peaks:
+        return {}
+    all_vertexes_counter = len(peaks)
+    previous_pr = page_rank.copy()
+    all_peaks = peaks | useless_peaks
+    start = True
+    no_exit_vert = [vert for vert in all_peaks if vert not in out_in_ribs]
+    base = (1 - damping) / all_vertexes_counter
+    while start or any(abs(previous_pr[v] - page_rank[v]) > tolerance for v in page_rank):
+        start = False
+        count("rank.iterations")
+        with timer("rank.iteration"):
+            previous_pr = page_rank.copy()
+            dangling_sum = sum(previous_pr[v] for v in no_exit_vert)
+            for peak in all_peaks:
+                coefficients_sum = 0.0
+                if peak in in_out_ribs:
+                    for point in in_out_ribs[peak]:
+                        point_rank = previous_pr[point]
+                        point_outs = len(out_in_ribs[point])
+                        if point_outs:
+                            coefficients_sum += point_rank / point_outs
+                page_rank[peak] = (base + damping *
+                                   (coefficients_sum + dangling_sum / all_vertexes_counter))
+    if sort_result:
+        page_rank = dict(sorted(page_rank.items(), key=lambda x: x[1], reverse=True))
+    return page_rank
+
+def get_rank_engine(engine: str, log=None):
+    """
+    Повертає функцію обчислення PageRank за назвою рушія.
+
+    Доступні рушії:
+      "dict" – get_page_rank на словниках і множинах;
+      "sparse" – sparse_page_rank на розріджених матрицях NumPy/SciPy;
+      "sharded" – sharded_page_rank, той самий метод, розподілений між
+      процесами;
+      "jacobi", "gauss_seidel", "adaptive" – solver_page_rank з відповідним
+      методом; звіт про збіжність (зміна на кожній ітерації, кількість
+      ітерацій, час) виводиться через log;
+      "blockrank" – blockrank_page_rank, степеневий метод зі стартом від
+      PageRank хостів.
+    Модулі рушіїв імпортуються лише тоді, коли вони потрібні.
+
+    :param engine: str, назва рушія.
+    :param log: callable | None, функція для звіту про збіжність рушіїв
+        pagerank_solvers.
+    :return: callable, функція з тими ж аргументами, що й get_page_rank.
+    """
+    if engine == "dict":
+        return get_page_rank
+    if engine == "sparse":
+        from pagerank_engine import sparse_page_rank
+        return sparse_page_rank
+    if engine == "sharded":
+        from sharded_pagerank import sharded_page_rank
+        return sharded_page_rank
+    if engine in ("jacobi", "gauss_seidel", "adaptive"):
+        from pagerank_solvers import solver_page_rank
+        return partial(solver_page_rank, solver=engine, log=log)
+    if engine == "blockrank":
+        from host_rank import blockrank_page_rank
+        return blockrank_page_rank
+    raise ValueError(f"Невідомий рушій PageRank: {engine}")
+
+
+def search_links(start_url: str, max_depth: int, output_path: str,
+                 max_links_per_page: int, workers: int = 8,
+                 cache_path: str | None = "fetch_cache.sqlite",
+                 log=print, cancel=None, progress=None,
+                 resume: bool = False, visited_store: str = "fingerprint",
+                 per_host: int = 4, delay: float = 0.0,
+                 checkpoint_interval: float = 30.0) -> bool:
+    """
+    Обходить веб-сторінки в ширину, починаючи з початкової URL-адреси,
+    та записує знайдені посилання у файл.
+
+    Кожен знайдений перехід записується у файл у форматі:
+        source_url -> destination_url
+
+    Сторінки одного рівня глибини завантажуються паралельно
+    (crawler.crawl) через keep-alive з'єднання, але до одного хоста
+    одночасно йде не більше per_host запитів з інтервалом delay секунд
+    (або Crawl-delay з robots.txt); заборонені robots.txt сторінки
+    пропускаються. Завантажені сторінки
+    зберігаються в дисковому кеші (fetch_cache.FetchCache), тож повторний
+    обхід тих самих сайтів не завантажує їх заново. Стан обходу
+    не частіше ніж раз на checkpoint_interval секунд зберігається в
+    контрольну точку output_path + ".checkpoint", тож перерваний обхід
+    можна продовжити (resume=True).
+
+    Відвідані сторінки зберігаються у сховищі visited_store (див.
+    visited_store.py): "exact" – множина повних URL, "fingerprint" –
+    компактна таблиця 64-бітних відбитків, "disk" – відбитки у файлі
+    SQLite output_path + ".visited.sqlite" для дуже великих обходів.
+
+    Модулі обходу імпортуються всередині функції, щоб ранжування вже
+    готового графа їх не завантажувало.
+
+    Обмеження:
+      максимальна глибина обходу (max_depth);
+      максимальна кількість посилань, взятих з однієї сторінки
+      (max_links_per_page);
+      пропускаються технічні/непотрібні посилання.
+
+    :param start_url: str, URL, з якої починається обхід.
+    :param max_depth: int, максимальна глибина обходу.
+    :param output_path: str, шлях до файлу, куди будуть записані ребра графа.
+    :param max_links_per_page: int, максимальна кількість посилань,
+        які беруться з однієї сторінки.
+    :param workers: int, кількість одночасних завантажень.
+    :param cache_path: str | None, файл кешу сторінок (None – без кешу).
+    :param log: callable, функція для виводу знайдених посилань.
+    :param cancel: threading.Event | None, подія для зупинки обходу.
+    :param progress: callable | None, функція для лічильників обходу.
+    :param resume: bool, чи продовжувати перерваний обхід з контрольної точки.
+    :param visited_store: str, сховище відвіданих сторінок ("exact",
+        "fingerprint" або "disk").
+    :param per_host: int, максимум одночасних запитів до одного хоста.
+    :param delay: float, мінімальний інтервал між запитами до одного хоста (с).
+    :param checkpoint_interval: float, мінімальний інтервал між контрольними
+        точками (с).
+    :return: bool, True, якщо обхід завершено, False, якщо його скасовано.
+    """
+    from crawler import crawl
+    from fetch_cache import FetchCache
+    from visited_store import make_visited_store, remove_visited_store
+
+    store_path = output_path + ".visited.sqlite"
+    visited = make_visited_store(visited_store, store_path)
+    cache = FetchCache(cache_path) if cache_path else None
+    try:
+        return crawl(start_url, max_depth, output_path, max_links_per_page,
+                     workers=workers, log=log, cache=cache,
+                     cancel=cancel, progress=progress,
+                     checkpoint_path=output_path + ".checkpoint", resume=resume,
+                     visited=visited, per_host=per_host, delay=delay,
+                     checkpoint_interval=checkpoint_interval)
+    finally:
+        visited.close()
+        if visited_store == "disk":
+            remove_visited_store(store_path)
+        if cache is not None:
+            cache.close()
+
+def run_crawler_and_pagerank(url: str, depth: int, max_links: int, engine: str = "dict",
+                             log=print, cancel=None, progress=None,
+                             resume: bool = False, stats_path: str | None = None,
+                             profile_path: str | None = None, per_host: int = 4,
+                             delay: float = 0.0) -> list[tuple]:
+    """
+    Запускає crawler, будує файл графа, рахує PageRank і виводить топ-10.
+
+    Кроки:
+      Викликає search_links для побудови файлу з ребрами ("menu.dot").
+      Потоково зчитує файл і створює словники графа (read_graph).
+      Обчислює PageRank для всіх вершин (get_page_rank).
+      Виводить через log топ-10 сторінок за рейтингом.
+
+    Функція не звертається до віджетів напряму, тому її можна
+    виконувати в окремому потоці (CrawlWorker). Помилки не
+    перехоплюються.
+
+    Якщо задано stats_path, таймери та лічильники всіх етапів
+    (instrumentation) записуються в цей JSON-файл; якщо задано
+    profile_path – туди записується профіль cProfile.
+
+    :param url: str, початкова URL для обходу.
+    :param depth: int, максимальна глибина пошуку (для crawler).
+    :param max_links: int, максимальна кількість посилань з однієї сторінки.
+    :param engine: str, рушій PageRank (див. get_rank_engine).
+    :param log: callable, функція для виводу повідомлень.
+    :param cancel: threading.Event | None, подія для зупинки обходу.
+    :param progress: callable | None, функція для лічильників обходу.
+    :param resume: bool, чи продовжувати перерваний обхід з контрольної точки.
+    :param stats_path: str | None, JSON-файл для таймерів і лічильників.
+    :param profile_path: str | None, файл для профілю cProfile.
+    :param per_host: int, максимум одночасних запитів до одного хоста.
+    :param delay: float, мінімальний інтервал між запитами до одного хоста (с).
+    :return: list[tuple[str, float]], топ-10 пар (URL, PageRank);
+        порожній список, якщо посилань немає або обхід скасовано.
+    """
+    with collect(stats_path, profile_path):
+        with timer("stage.crawl"):
+            completed = search_links(url, depth, "menu.dot", max_links, log=log,
+                                     cancel=cancel, progress=progress, resume=resume,
+                                     per_host=per_host, delay=delay)
+        if not completed:
+            log("Обхід скасовано. Його можна продовжити пізніше.")
+            return []
+        log('')
+        log('')
+        log("Обхід завершено. Читаємо файл та рахуємо PageRank...")
+        with timer("stage.graph"):
+            (vertical_in, vertical_out,
+             pagerank, vertexes, not_used_vertexes) = read_graph("menu.dot")
+        if not vertexes:
+            log("Не знайдено жодного посилання.")
+            return []
+        rank_engine = get_rank_engine(engine, log)
+        with timer("stage.rank"):
+            page_ranking = rank_engine(pagerank, vertical_out, vertical_in,
+                                       vertexes, not_used_vertexes, sort_result=False)
+        with timer("stage.top_k"):
+            top10 = top_k_items(page_ranking, 10)
+    log("=== Топ-10 сторінок за PageRank ===")
+    for url_res, pr in top10:
+        log(f"{pr:.6f}  {url_res}")
+    return top10
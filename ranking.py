@@ -0,0 +1,70 @@
+"""Вибір найкращих сторінок за PageRank без повного сортування"""
+
+import heapq
+from operator import itemgetter
+
+
+def top_k_items(page_rank: dict, k: int = 10, offset: int = 0) -> list[tuple]:
+    """
+    Повертає сторінку рейтингу зі словника PageRank за O(n log k).
+
+    Замість сортування всього словника тримається купа з offset + k
+    найкращих значень. Однакові значення лишаються в порядку словника.
+
+    :param page_rank: dict[str, float], словник PageRank.
+    :param k: int, кількість вершин на сторінці рейтингу.
+    :param offset: int, скільки найкращих вершин пропустити (для пагінації).
+    :return: list[tuple[str, float]], пари (URL, PageRank) за спаданням.
+    """
+    if k <= 0:
+        return []
+    best = heapq.nlargest(offset + k, page_rank.items(), key=itemgetter(1))
+    return best[offset:]
+
+
+def above_threshold(page_rank: dict, threshold: float, limit: int | None = None) -> list[tuple]:
+    """
+    Повертає вершини з PageRank не меншим за поріг, за спаданням.
+
+    :param page_rank: dict[str, float], словник PageRank.
+    :param threshold: float, мінімальне значення PageRank.
+    :param limit: int | None, максимальна кількість вершин (None – усі).
+    :return: list[tuple[str, float]], пари (URL, PageRank) за спаданням.
+    """
+    selected = ((url, pr) for url, pr in page_rank.items() if pr >= threshold)
+    if limit is None:
+        return sorted(selected, key=itemgetter(1), reverse=True)
+    return heapq.nlargest(limit, selected, key=itemgetter(1))
+
+
+def top_k_indices(scores, k: int = 10, offset: int = 0):
+    """
+    Повертає номери найкращих вершин з вектора PageRank (numpy.ndarray).
+
+    Використовується argpartition (O(n)), а сортуються лише offset + k
+    вибраних значень.
+
+    :param scores: numpy.ndarray, вектор PageRank.
+    :param k: int, кількість вершин на сторінці рейтингу.
+    :param offset: int, скільки найкращих вершин пропустити (для пагінації).
+    :return: numpy.ndarray, номери вершин за спаданням PageRank.
+    """
+    count = min(offset + k, len(scores))
+    if k <= 0 or count <= offset:
+        return scores[:0].astype(int)
+    head = (-scores).argpartition(count - 1)[:count]
+    head = head[(-scores[head]).argsort(kind="stable")]
+    return head[offset:count]
+
+
+def indices_above_threshold(scores, threshold: float):
+    """
+    Повертає номери вершин з PageRank не меншим за поріг, за спаданням.
+
+    :param scores: numpy.ndarray, вектор PageRank.
+    :param threshold: float, мінімальне значення PageRank.
+    :return: numpy.ndarray, номери вершин за спаданням PageRank.
+    """
+    selected = (scores >= threshold).nonzero()[0]
+    return selected[(-scores[selected]).argsort(kind="stable")]
+
@@ -1,132 +1,39 @@
 """PageRank crawler with PyQt5"""
 
 import sys
-import re
-from urllib.parse import urljoin, urldefrag
-from urllib.request import urlopen, Request
+import threading
 
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout
 from PyQt5.QtWidgets import QLabel, QLineEdit, QPushButton, QTextEdit
-from PyQt5.QtWidgets import QMessageBox
+from PyQt5.QtWidgets import QMessageBox, QCheckBox
+
+# read_file, create_dictionaries, get_page_rank та інші функції без GUI лишаються
+# доступними як ready_project.* для сумісності.
+from pipeline import (create_dictionaries, get_page_rank, get_rank_engine, read_file,
+                      run_crawler_and_pagerank, search_links)
 
 APP = None
 WINDOW = None
 URL_EDIT = None
 DEPTH_EDIT = None
 MAX_LINKS = None
+PER_HOST_EDIT = None
+DELAY_EDIT = None
 START_BUT = None
+CANCEL_BUT = None
+RESUME_CHECK = None
+STATS_LABEL = None
 LOG_TXT = None
-
-def read_file(file_name: str) -> list[str]:
-    """
-    Зчитує текстовий файл з описом графа посилань.
-
-    Кожен рядок файлу має формат:
-        url -> url
-
-    :param file_name: str, шлях до файлу (наприклад, "menu.dot").
-    :return: list[str], список рядків файлу без додаткової обробки.
-    """
-    with open(file_name, 'r', encoding='utf-8') as file:
-        file_con = file.readlines()
-    return file_con
-
-def create_dictionaries(file_content: list[str]) -> tuple:
-    """
-    Створює словники структури графа за вмістом файлу.
-
-    Зі списку рядків формату "src -> dst" будує:
-      vertical_in – словник {вершина: множина вхідних сусідів};
-      vertical_out – словник {вершина: множина вихідних сусідів};
-      page_rank – словник початкових значень PageRank;
-      vertexes – множина всіх вершин, які зустрілися в ребрах;
-      not_used_vertexes – множина вершин без ребер.
-
-    :param file_content: list[str], список рядків файлу з ребрами графа.
-    :return: tuple[dict, dict, dict, set, set], кортеж 
-    (vertical_in, vertical_out, page_rank, vertexes, not_used_vertexes).
-    """
-    vertical_out = {}
-    vertical_in = {}
-    page_rank = {}
-    vertexes = set()
-    not_used_vertexes = set()
-    for elem in file_content:
-        elem = elem.strip()
-        if not elem:
-            continue
-        if '->' not in elem:
-            continue
-        start_point, end_point = elem.split('->', 1)
-        start_point = start_point.strip()
-        end_point = end_point.strip()
-        if not start_point or not end_point:
-            continue
-        vertical_out.setdefault(start_point, set()).add(end_point)
-        vertical_in.setdefault(end_point, set()).add(start_point)
-        vertexes.add(start_point)
-        vertexes.add(end_point)
-    if not vertexes:
-        return vertical_in, vertical_out, {}, vertexes, not_used_vertexes
-    page_rank = dict.fromkeys(vertexes, 1 / len(vertexes))
-    page_rank = dict(sorted(page_rank.items(), key=lambda x: x[0]))
-    return vertical_in, vertical_out, page_rank, vertexes, not_used_vertexes
-
-def get_page_rank(page_rank, out_in_ribs, in_out_ribs, peaks, useless_peaks):
-    """
-    Обчислює значення PageRank для заданого орієнтованого графа.
-
-    Використовується класична ітеративна формула PageRank:
-        PR(v) = (1 - d) / N + d * (сума по всіх u, які ведуть у v) +
-        внесок "висячих" вершин.
-
-    Ітерації тривають, доки зміни PR для всіх вершин не стануть
-    меншими за 1e-6.
-
-    :param page_rank: dict[str, float], початковий словник PageRank.
-    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер
-        {вершина: множина сусідів, куди є ребро}.
-    :param in_out_ribs: dict[str, set[str]], словник вхідних ребер
-        {вершина: множина вершин, звідки є ребро}.
-    :param peaks: set[str], множина вершин графа.
-    :param useless_peaks: set[str], множина не потрібних вершин.
-    :return: dict[str, float], словник PageRank-значень, відсортований
-        за спаданням значення.
-    """
-    if not peaks:
-        return {}
-    all_vertexes_counter = len(peaks)
-    previous_pr = page_rank.copy()
-    all_peaks = peaks | useless_peaks
-    start = True
-    no_exit_vert = [vert for vert in all_peaks if vert not in out_in_ribs]
-    damping = 0.85
-    base = (1 - damping) / all_vertexes_counter
-    while start or any(abs(previous_pr[v] - page_rank[v]) > 1e-6 for v in page_rank):
-        start = False
-        previous_pr = page_rank.copy()
-        dangling_sum = sum(previous_pr[v] for v in no_exit_vert)
-        for peak in all_peaks:
-            coefficients_sum = 0.0
-            if peak in in_out_ribs:
-                for point in in_out_ribs[peak]:
-                    point_rank = previous_pr[point]
-                    point_outs = len(out_in_ribs[point])
-                    if point_outs:
-                        coefficients_sum += point_rank / point_outs
-            page_rank[peak] = (base + damping *
-                               (coefficients_sum + dangling_sum / all_vertexes_counter))
-    page_rank = dict(sorted(page_rank.items(), key=lambda x: x[1], reverse=True))
-    return page_rank
-
+WORKER = None
 
 def log_message(msg: str):
     """
-    Виводить повідомлення у QTextEdit та оновлює інтерфейс.
+    Виводить повідомлення у QTextEdit.
 
     Якщо глобальна змінна LOG_TXT не None, то додається рядок
-    до текстового поля логів, курсор переноситься в кінець,
-    а події Qt обробляються для оновлення GUI.
+    до текстового поля логів, а курсор переноситься в кінець.
+    Викликається лише з потоку GUI.
 
     :param msg: str, текст повідомлення для виводу.
     """
@@ -134,172 +41,157 @@ def log_message(msg: str):
     if LOG_TXT is not None:
         LOG_TXT.append(msg)
         LOG_TXT.moveCursor(LOG_TXT.textCursor().End)
-        QApplication.processEvents()
 
-def search_links(start_url: str, max_depth: int, output_path: str, max_links_per_page: int):
+def log_messages(messages: list[str]):
     """
-    Рекурсивно обходить веб-сторінки, починаючи з початкової URL-адреси,
-    та записує знайдені посилання у файл.
-
-    Кожен знайдений перехід записується у файл у форматі:
-        source_url -> destination_url
-
-    Обмеження:
-      максимальна глибина обходу (max_depth);
-      максимальна кількість посилань, взятих з однієї сторінки
-      (max_links_per_page);
-      пропускаються технічні/непотрібні посилання.
-
-    :param start_url: str, URL, з якої починається обхід.
-    :param max_depth: int, максимальна глибина рекурсії.
-    :param output_path: str, шлях до файлу, куди будуть записані ребра графа.
-    :param max_links_per_page: int, максимальна кількість посилань,
-        які беруться з однієї сторінки.
+    Виводить пачку повідомлень у QTextEdit одним оновленням.
+
+    :param messages: list[str], рядки для виводу.
     """
-    visited = set()
-    href_pattern = r'href\s*=\s*["\']([^"\']+)["\']'
-    def is_url(url: str) -> bool:
-        """
-        Перевіряє, чи є рядок повноцінною HTTP(S)-URL-адресою.
+    if messages:
+        log_message("\n".join(messages))
 
-        :param url: str, рядок для перевірки.
-        :return: bool, True, якщо починається з "http://" або "https://",
-                 інакше False.
+def show_progress(stats: dict):
+    """
+    Оновлює мітку з лічильниками обходу.
+
+    :param stats: dict, лічильники crawler.crawl (pages, pages_per_sec,
+        edges, queue, depth).
+    """
+    global STATS_LABEL
+    if STATS_LABEL is not None:
+        STATS_LABEL.setText(f"Сторінок: {stats['pages']}  "
+                            f"({stats['pages_per_sec']:.1f} стор./с)  "
+                            f"Ребер: {stats['edges']}  "
+                            f"У черзі: {stats['queue']}  "
+                            f"Глибина: {stats['depth']}")
+
+class CrawlWorker(QThread):
+    """
+    Потік, у якому виконується run_crawler_and_pagerank.
+
+    Повідомлення логу та останні лічильники обходу накопичуються в
+    буфері, а таймер QTimer у потоці GUI кожні LOG_INTERVAL секунд
+    забирає їх і передає в GUI (сигнали log_batch та progress). Тож
+    оновлення обмежені за частотою, але з'являються вчасно навіть тоді,
+    коли обхід надовго зупинився на мережі. Метод cancel зупиняє обхід
+    після поточної сторінки.
+    """
+
+    LOG_INTERVAL = 0.2
+    log_batch = pyqtSignal(list)
+    progress = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, url: str, depth: int, max_links: int, engine: str = "dict",
+                 resume: bool = False, per_host: int = 4, delay: float = 0.0):
+        super().__init__()
+        self.url = url
+        self.depth = depth
+        self.max_links = max_links
+        self.engine = engine
+        self.resume = resume
+        self.per_host = per_host
+        self.delay = delay
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._stats = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(self.LOG_INTERVAL * 1000))
+        self._timer.timeout.connect(self.flush)
+        self.started.connect(self._timer.start)
+        self.finished.connect(self._stop_timer)
+
+    def log(self, msg: str):
         """
-        return url.startswith("http://") or url.startswith("https://")
-    def get_html(url: str) -> str | None:
+        Додає повідомлення до буфера (викликається з потоку обходу).
+
+        :param msg: str, текст повідомлення.
         """
-        Завантажує HTML-вміст сторінки за вказаною URL-адресою.
+        with self._lock:
+            self._buffer.append(msg)
 
-        Використовує простий HTTP-запит з User-Agent, декодує
-        відповідь як UTF-8 з ігноруванням помилок.
+    def report(self, stats: dict):
+        """
+        Запам'ятовує останні лічильники обходу (викликається з потоку обходу).
 
-        :param url: str, URL сторінки, яку потрібно завантажити.
-        :return: str | None, текст HTML або None, якщо сталася помилка
-            (таймаут, помилка мережі тощо).
+        :param stats: dict, лічильники crawler.crawl.
         """
+        with self._lock:
+            self._stats = stats
+
+    def flush(self):
+        """Передає в GUI накопичені повідомлення та останні лічильники (потік GUI)."""
+        with self._lock:
+            messages, self._buffer = self._buffer, []
+            stats, self._stats = self._stats, None
+        if messages:
+            self.log_batch.emit(messages)
+        if stats is not None:
+            self.progress.emit(stats)
+
+    def _stop_timer(self):
+        """Зупиняє таймер і передає залишок буфера після завершення потоку."""
+        self._timer.stop()
+        self.flush()
+
+    def cancel(self):
+        """Просить зупинити обхід після поточної сторінки."""
+        self.cancel_event.set()
+
+    def run(self):
+        """Виконує обхід і обчислення PageRank у цьому потоці."""
         try:
-            req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-            with urlopen(req, timeout=5) as resp:
-                return resp.read().decode("utf-8", errors="ignore")
-        except Exception:
-            return None
-    with open(output_path, "w", encoding="utf-8") as f_out:
-        def write_line(src: str, dst: str):
-            """
-            Записує ребро графа у файл.
-
-            Формат рядка:
-                src -> dst
-
-            :param src: str, вихідна сторінка.
-            :param dst: str, цільова сторінка.
-            """
-            f_out.write(f"{src} -> {dst}\n")
-        def search(url: str, depth: int):
-            """
-            Рекурсивна функція обходу посилань з однієї сторінки.
-
-            Для кожної сторінки:
-              завантажує HTML;
-              знаходить усі href-посилання;
-              фільтрує зайві/непотрібні;
-              нормалізує URL (urljoin + urldefrag);
-              записує перехід у файл;
-              рекурсивно продовжує обхід до заданої глибини.
-
-            :param url: str, поточна сторінка для обходу.
-            :param depth: int, поточна глибина рекурсії.
-            """
-            if depth > max_depth or url in visited:
-                return
-            visited.add(url)
-            html = get_html(url)
-            if html is None:
-                return
-            next_depth = depth + 1
-            stop_recursion = next_depth > max_depth
-            links_taken = 0
-            for match in re.finditer(href_pattern, html, flags=re.IGNORECASE):
-                href = match.group(1).strip()
-                if (href.startswith("mailto:") or
-                        href.startswith("javascript:") or
-                        'css' in href or
-                        'json' in href or
-                        '.ico' in href or
-                        '.svg' in href or
-                        '.js' in href or
-                        'creativecommons' in href or
-                        'png' in href or
-                        'jpg' in href):
-                    continue
-                full_url, _ = urldefrag(urljoin(url, href))
-                if not is_url(full_url):
-                    continue
-                write_line(url, full_url)
-                log_message(f"   -> {full_url}")
-                links_taken += 1
-                if not stop_recursion:
-                    search(full_url, next_depth)
-                if links_taken >= max_links_per_page:
-                    break
-        search(start_url, depth=0)
-
-def run_crawler_and_pagerank(url: str, depth: int, max_links: int):
+            run_crawler_and_pagerank(self.url, self.depth, self.max_links, self.engine,
+                                     log=self.log, cancel=self.cancel_event,
+                                     progress=self.report, resume=self.resume,
+                                     per_host=self.per_host, delay=self.delay)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+def show_error(msg: str):
     """
-    Запускає crawler, будує файл графа, рахує PageRank і виводить топ-10.
+    Показує діалогове вікно з помилкою з потоку обходу.
 
-    Кроки:
-      Викликає search_links для побудови файлу з ребрами ("menu.dot").
-      Зчитує файл і створює словники графа (create_dictionaries).
-      Обчислює PageRank для всіх вершин (get_page_rank).
-      Виводить у LOG_TXT топ-10 сторінок за рейтингом.
-
-    У разі помилки показує діалогове вікно з повідомленням.
-
-    :param url: str, початкова URL для обходу.
-    :param depth: int, максимальна глибина пошуку (для crawler).
-    :param max_links: int, максимальна кількість посилань з однієї сторінки.
+    :param msg: str, текст помилки.
     """
-    global START_BUT
-    try:
-        search_links(url, depth, "menu.dot", max_links)
-        log_message('')
-        log_message('')
-        log_message("Обхід завершено. Читаємо файл та рахуємо PageRank...")
-        file_content = read_file("menu.dot")
-        (vertical_in, vertical_out,
-         pagerank, vertexes, not_used_vertexes) = create_dictionaries(file_content)
-        if not vertexes:
-            log_message("Не знайдено жодного посилання.")
-        else:
-            page_ranking = get_page_rank(pagerank, vertical_out,
-                                         vertical_in, vertexes, not_used_vertexes)
-            top10 = list(page_ranking.items())[:10]
-            log_message("=== Топ-10 сторінок за PageRank ===")
-            for url_res, pr in top10:
-                log_message(f"{pr:.6f}  {url_res}")
-    except Exception as e:
-        QMessageBox.critical(WINDOW, "Помилка", str(e))
-    finally:
-        if START_BUT is not None:
-            START_BUT.setEnabled(True)
+    QMessageBox.critical(WINDOW, "Помилка", msg)
+
+def crawl_finished():
+    """Повертає кнопки в початковий стан після завершення потоку обходу."""
+    global START_BUT, CANCEL_BUT, WORKER
+    if START_BUT is not None:
+        START_BUT.setEnabled(True)
+    if CANCEL_BUT is not None:
+        CANCEL_BUT.setEnabled(False)
+    WORKER = None
+
+def cancel_crawling():
+    """Обробляє натискання кнопки скасування."""
+    global WORKER, CANCEL_BUT
+    if WORKER is not None:
+        WORKER.cancel()
+        CANCEL_BUT.setEnabled(False)
+        log_message("Скасування...")
 
 def start_crawling():
     """
     Обробляє натискання кнопки старту, зчитує дані з полів і запускає обхід.
 
     Кроки:
-      Зчитує URL, глибину та max_links з полів вводу.
+      Зчитує URL, глибину, max_links та обмеження для хоста з полів вводу.
       Перевіряє, що URL непорожній.
       Перетворює глибину та кількість лінків на int та перевіряє,
-      що вони додатні.
-      Очищує лог, блокує кнопку старту.
-      Викликає run_crawler_and_pagerank зі зчитаними параметрами.
+      що вони додатні; запитів до хоста – додатне ціле, затримка –
+      невід'ємне число секунд.
+      Очищує лог, блокує кнопку старту, вмикає кнопку скасування.
+      Запускає run_crawler_and_pagerank у потоці CrawlWorker.
 
     У разі некоректного вводу показує попередження через QMessageBox.
     """
     global URL_EDIT, DEPTH_EDIT, MAX_LINKS, LOG_TXT, START_BUT
+    global CANCEL_BUT, STATS_LABEL, WORKER, RESUME_CHECK, PER_HOST_EDIT, DELAY_EDIT
     url = URL_EDIT.text().strip()
     depth_text = DEPTH_EDIT.text().strip()
     max_links_text = MAX_LINKS.text().strip()
@@ -333,9 +225,26 @@ def start_crawling():
     except ValueError:
         QMessageBox.warning(WINDOW,"Помилка", "Глибина має бути додатним цілим числом або 0.")
         return
+    try:
+        per_host = int(PER_HOST_EDIT.text().strip())
+        delay = float(DELAY_EDIT.text().strip().replace(",", "."))
+        if per_host <= 0 or delay < 0:
+            int('s')
+    except ValueError:
+        QMessageBox.warning(WINDOW, "Помилка", "Кількість запитів до хоста має бути додатним "
+                            "цілим числом, а затримка – невід'ємним числом секунд.")
+        return
     LOG_TXT.clear()
+    STATS_LABEL.setText("")
     START_BUT.setEnabled(False)
-    run_crawler_and_pagerank(url, depth, max_links)
+    CANCEL_BUT.setEnabled(True)
+    WORKER = CrawlWorker(url, depth, max_links, resume=RESUME_CHECK.isChecked(),
+                         per_host=per_host, delay=delay)
+    WORKER.log_batch.connect(log_messages)
+    WORKER.progress.connect(show_progress)
+    WORKER.failed.connect(show_error)
+    WORKER.finished.connect(crawl_finished)
+    WORKER.start()
 
 def build_gui():
     """
@@ -345,16 +254,20 @@ def build_gui():
       поле для вводу початкового URL;
       поле для вводу максимальної глибини пошуку;
       поле для вводу максимальної кількості лінків з однієї сторінки;
-      кнопку запуску обходу та обчислення PageRank;
+      поля для кількості одночасних запитів до хоста та затримки між ними;
+      кнопки запуску (обхід та обчислення PageRank) і скасування обходу;
+      прапорець продовження перерваного обходу;
+      мітку з лічильниками обходу (сторінок/с, ребра, черга);
       QTextEdit для відображення логів виконання.
 
-    Глобальні змінні WINDOW, URL_EDIT, DEPTH_EDIT, MAX_LINKS,
-    START_BUT, LOG_TXT заповнюються посиланнями на відповідні віджети.
+    Глобальні змінні WINDOW, URL_EDIT, DEPTH_EDIT, MAX_LINKS, PER_HOST_EDIT,
+    DELAY_EDIT, START_BUT, CANCEL_BUT, RESUME_CHECK, STATS_LABEL, LOG_TXT заповнюються
+    посиланнями на відповідні віджети.
 
     :return: QWidget, створене головне вікно QWidget.
     """
-    global WINDOW, URL_EDIT, DEPTH_EDIT, MAX_LINKS
-    global START_BUT, LOG_TXT
+    global WINDOW, URL_EDIT, DEPTH_EDIT, MAX_LINKS, PER_HOST_EDIT, DELAY_EDIT
+    global START_BUT, CANCEL_BUT, RESUME_CHECK, STATS_LABEL, LOG_TXT
     WINDOW = QWidget()
     WINDOW.setWindowTitle("PageRank Web Crawler")
     WINDOW.resize(900, 600)
@@ -381,10 +294,30 @@ def build_gui():
     max_links_layout.addWidget(max_links_label)
     max_links_layout.addWidget(MAX_LINKS)
     form_layout.addLayout(max_links_layout)
+    host_layout = QHBoxLayout()
+    per_host_label = QLabel("Одночасних запитів до одного сайту:")
+    PER_HOST_EDIT = QLineEdit("4")
+    delay_label = QLabel("Затримка між запитами до сайту (с):")
+    DELAY_EDIT = QLineEdit("0")
+    host_layout.addWidget(per_host_label)
+    host_layout.addWidget(PER_HOST_EDIT)
+    host_layout.addWidget(delay_label)
+    host_layout.addWidget(DELAY_EDIT)
+    form_layout.addLayout(host_layout)
     main_layout.addLayout(form_layout)
+    RESUME_CHECK = QCheckBox("Продовжити перерваний обхід (ті самі параметри)")
+    main_layout.addWidget(RESUME_CHECK)
     START_BUT = QPushButton("Запустити пошук та PageRank")
     START_BUT.clicked.connect(start_crawling)
-    main_layout.addWidget(START_BUT)
+    CANCEL_BUT = QPushButton("Скасувати")
+    CANCEL_BUT.setEnabled(False)
+    CANCEL_BUT.clicked.connect(cancel_crawling)
+    buttons_layout = QHBoxLayout()
+    buttons_layout.addWidget(START_BUT, stretch=3)
+    buttons_layout.addWidget(CANCEL_BUT, stretch=1)
+    main_layout.addLayout(buttons_layout)
+    STATS_LABEL = QLabel("")
+    main_layout.addWidget(STATS_LABEL)
     log_label = QLabel("Процес обходу сторінок:")
     main_layout.addWidget(log_label)
     LOG_TXT = QTextEdit()
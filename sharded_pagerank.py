@@ -0,0 +1,188 @@
+"""Паралельний PageRank: вершини поділено на шарди, що рахуються в окремих процесах"""
+
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+from scipy import sparse
+
+from pagerank_engine import (DAMPING, MAX_ITERATIONS, TOLERANCE, build_transition_matrix,
+                             intern_vertexes)
+
+_SHARED = {}
+_SHARDS = {}
+
+
+def _to_shared(array: np.ndarray, blocks: dict) -> tuple:
+    """
+    Копіює масив у новий блок спільної пам'яті.
+
+    :param array: numpy.ndarray, масив для копіювання.
+    :param blocks: dict, словник {назва: блок}, куди додається створений
+        блок (для звільнення).
+    :return: tuple[str, tuple, str], опис блоку (назва, форма, тип).
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    blocks[block.name] = block
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block.name, array.shape, array.dtype.str
+
+
+def _attach(description: tuple) -> np.ndarray:
+    """
+    Відкриває в процесі-працівнику масив зі спільної пам'яті.
+
+    :param description: tuple[str, tuple, str], опис блоку з _to_shared.
+    :return: numpy.ndarray, масив над спільною пам'яттю.
+    """
+    name, shape, dtype = description
+    block = shared_memory.SharedMemory(name=name)
+    _SHARED.setdefault("blocks", []).append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _init_worker(descriptions: dict, bounds: list, damping: float):
+    """
+    Підключає процес-працівник до спільних масивів (ініціалізатор Pool).
+
+    :param descriptions: dict[str, tuple], описи блоків спільної пам'яті.
+    :param bounds: list[int], межі шардів (шард i – вершини bounds[i]..bounds[i + 1]).
+    :param damping: float, коефіцієнт згасання.
+    """
+    for key, description in descriptions.items():
+        _SHARED[key] = _attach(description)
+    _SHARED["bounds"] = bounds
+    _SHARED["damping"] = damping
+    _SHARDS.clear()
+
+
+def _shard_matrix(shard: int):
+    """
+    Повертає рядки матриці переходів для шарда (кешуються в процесі).
+
+    :param shard: int, номер шарда.
+    :return: scipy.sparse.csr_matrix, рядки bounds[shard]..bounds[shard + 1].
+    """
+    matrix = _SHARDS.get(shard)
+    if matrix is None:
+        low, high = _SHARED["bounds"][shard], _SHARED["bounds"][shard + 1]
+        indptr = _SHARED["indptr"]
+        start, end = indptr[low], indptr[high]
+        matrix = sparse.csr_matrix((_SHARED["data"][start:end], _SHARED["indices"][start:end],
+                                    indptr[low:high + 1] - start),
+                                   shape=(high - low, len(indptr) - 1))
+        _SHARDS[shard] = matrix
+    return matrix
+
+
+def _shard_step(task: tuple) -> tuple[float, float]:
+    """
+    Рахує нові значення PageRank для вершин одного шарда.
+
+    Читає поточний вектор з буфера source і пише результат у свою
+    частину іншого буфера, тож шарди не перетинаються при записі.
+
+    :param task: tuple[int, int, float], (номер шарда, номер буфера з
+        поточним вектором, сума PageRank "висячих" вершин).
+    :return: tuple[float, float], L1-зміна на шарді та сума нових
+        значень "висячих" вершин шарда.
+    """
+    shard, source, dangling_sum = task
+    low, high = _SHARED["bounds"][shard], _SHARED["bounds"][shard + 1]
+    rank = _SHARED[f"rank{source}"]
+    new_rank = _SHARED[f"rank{1 - source}"]
+    size = len(rank)
+    damping = _SHARED["damping"]
+    values = (1 - damping) / size + damping * (_shard_matrix(shard) @ rank + dangling_sum / size)
+    delta = float(np.abs(values - rank[low:high]).sum())
+    new_rank[low:high] = values
+    return delta, float(values[_SHARED["dangling"][low:high]].sum())
+
+
+def sharded_power_iteration(matrix, dangling, workers: int | None = None,
+                            shards: int | None = None, damping: float = DAMPING,
+                            tolerance: float = TOLERANCE,
+                            max_iterations: int = MAX_ITERATIONS) -> tuple:
+    """
+    Степеневий метод, у якому кожна ітерація розподілена між процесами.
+
+    Вершини діляться на shards суміжних діапазонів. Матриця переходів
+    (CSR), маска "висячих" вершин та два буфери вектора PageRank лежать
+    у multiprocessing.shared_memory, тож між процесами на кожній ітерації
+    передаються лише номер буфера та сума "висячих" вершин. Головний
+    процес збирає L1-зміни та нову суму "висячих" вершин з усіх шардів
+    і вирішує, чи продовжувати.
+
+    :param matrix: scipy.sparse.csr_matrix, матриця переходів.
+    :param dangling: numpy.ndarray, булева маска "висячих" вершин.
+    :param workers: int | None, кількість процесів (None – кількість ядер).
+    :param shards: int | None, кількість шардів (None – 4 на процес).
+    :param damping: float, коефіцієнт згасання.
+    :param tolerance: float, поріг збіжності за L1-нормою.
+    :param max_iterations: int, максимальна кількість ітерацій.
+    :return: tuple[numpy.ndarray, int], вектор PageRank та кількість ітерацій.
+    """
+    matrix = sparse.csr_matrix(matrix)
+    size = matrix.shape[0]
+    workers = workers or os.cpu_count() or 1
+    shards = max(1, min(shards or 4 * workers, size))
+    bounds = [size * i // shards for i in range(shards + 1)]
+    rank = np.full(size, 1.0 / size)
+    blocks = {}
+    try:
+        descriptions = {
+            "indptr": _to_shared(matrix.indptr, blocks),
+            "indices": _to_shared(matrix.indices, blocks),
+            "data": _to_shared(matrix.data, blocks),
+            "dangling": _to_shared(np.asarray(dangling, dtype=bool), blocks),
+            "rank0": _to_shared(rank, blocks),
+            "rank1": _to_shared(rank, blocks),
+        }
+        source = 0
+        dangling_sum = float(rank[dangling].sum())
+        iterations = 0
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(descriptions, bounds, damping)) as pool:
+            while iterations < max_iterations:
+                iterations += 1
+                results = pool.map(_shard_step,
+                                   [(shard, source, dangling_sum) for shard in range(shards)])
+                source = 1 - source
+                dangling_sum = sum(part for _, part in results)
+                if sum(delta for delta, _ in results) < tolerance:
+                    break
+        name, shape, dtype = descriptions[f"rank{source}"]
+        rank = np.ndarray(shape, dtype=np.dtype(dtype), buffer=blocks[name].buf).copy()
+        return rank, iterations
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+
+def sharded_page_rank(page_rank, out_in_ribs, in_out_ribs, peaks, useless_peaks,
+                      sort_result: bool = True, workers: int | None = None):
+    """
+    Обчислює PageRank з тими ж аргументами, що й get_page_rank, у кількох процесах.
+
+    :param page_rank: dict[str, float], початковий словник PageRank
+        (не використовується: розподілений метод стартує з 1/N).
+    :param out_in_ribs: dict[str, set[str]], словник вихідних ребер.
+    :param in_out_ribs: dict[str, set[str]], словник вхідних ребер
+        (не потрібен для побудови матриці, залишено для сумісності).
+    :param peaks: set[str], множина вершин графа.
+    :param useless_peaks: set[str], множина не потрібних вершин.
+    :param sort_result: bool, чи сортувати результат.
+    :param workers: int | None, кількість процесів (None – кількість ядер).
+    :return: dict[str, float], словник PageRank-значень, відсортований
+        за спаданням значення (якщо sort_result).
+    """
+    if not peaks:
+        return {}
+    urls, index = intern_vertexes(peaks | useless_peaks)
+    matrix, dangling = build_transition_matrix(out_in_ribs, index)
+    rank, _ = sharded_power_iteration(matrix, dangling, workers)
+    if not sort_result:
+        return dict(zip(urls, rank.tolist()))
+    order = np.argsort(-rank, kind="stable")
+    return {urls[i]: float(rank[i]) for i in order}
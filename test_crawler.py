@@ -0,0 +1,125 @@
+"""Перевірка crawler.crawl на локальному HTTP-сервері (python -m unittest test_crawler)"""
+
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crawler import crawl
+from link_extractor import LinkExtractor
+
+PAGES = {
+    "/": ('<a href="/style.css">css</a><a href="mailto:me@example.com">mail</a>'
+          '<a href="https://creativecommons.org/licenses/">cc</a><a href="/logo.png">png</a>'
+          '<a href="/a">a</a><a href="/a#top">a again</a><a href="b">b</a>'
+          '<a href="/c">c</a><a href="/d">d</a>'),
+    "/a": '<a href="/a1">a1</a><a href="/a2">a2</a>',
+    "/b": '<a href="/b1">b1</a>',
+    "/c": '<a href="/c1">c1</a>',
+    "/a1": '<a href="/deep">deep</a>',
+    "/messy": ('<a href="/news/\n  item">news</a><a href="/a/b/..">up</a>'
+               '<a href="/a/">same</a><a href="/a/./x">x</a><a href="\t/c\r\n">c</a>'),
+}
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """Віддає сторінки PAGES; інші шляхи (зокрема robots.txt) – 404."""
+
+    protocol_version = "HTTP/1.1"
+    requested = []
+
+    def do_GET(self):
+        self.requested.append(self.path)
+        page = PAGES.get(self.path)
+        body = f"<html><body>{page}</body></html>".encode() if page is not None else b""
+        self.send_response(200 if page is not None else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CrawlTest(unittest.TestCase):
+    """Обхід через справжні fetch_html і ConnectionPool."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.root = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        SiteHandler.requested = []
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, "menu.dot")
+
+    def crawl_edges(self, max_depth: int, max_links: int, start: str = "/") -> list[str]:
+        self.assertTrue(crawl(self.root + start, max_depth, self.output, max_links, workers=4))
+        with open(self.output, encoding="utf-8") as file:
+            return file.read().splitlines()
+
+    def edge(self, start: str, end: str) -> str:
+        return f"{self.root}{start} -> {self.root}{end}"
+
+    def test_start_page_only(self):
+        edges = self.crawl_edges(0, 3)
+        self.assertEqual(edges, [self.edge("/", "/a"), self.edge("/", "/b"),
+                                 self.edge("/", "/c")])
+        self.assertNotIn("/a", SiteHandler.requested)
+
+    def test_depth_and_link_limits(self):
+        edges = self.crawl_edges(1, 3)
+        self.assertEqual(sorted(edges), sorted([
+            self.edge("/", "/a"), self.edge("/", "/b"), self.edge("/", "/c"),
+            self.edge("/a", "/a1"), self.edge("/a", "/a2"),
+            self.edge("/b", "/b1"), self.edge("/c", "/c1"),
+        ]))
+        self.assertNotIn("/d", SiteHandler.requested)
+        self.assertNotIn("/a1", SiteHandler.requested)
+
+    def test_filtered_links(self):
+        edges = self.crawl_edges(0, 100)
+        targets = [line.partition(" -> ")[2] for line in edges]
+        self.assertEqual(targets, [self.root + path for path in ("/a", "/b", "/c", "/d")])
+        self.assertNotIn("/style.css", SiteHandler.requested)
+        self.assertNotIn("/logo.png", SiteHandler.requested)
+
+    def test_messy_hrefs(self):
+        edges = self.crawl_edges(0, 100, "/messy")
+        self.assertEqual(edges, [self.edge("/messy", "/news/  item"),
+                                 self.edge("/messy", "/a/"),
+                                 self.edge("/messy", "/a/x"),
+                                 self.edge("/messy", "/c")])
+
+
+class NormalizeTest(unittest.TestCase):
+    """LinkExtractor.normalize дає той самий URL, що й urljoin без фрагмента."""
+
+    def test_matches_urljoin(self):
+        extractor = LinkExtractor()
+        base = "http://site.com/x/y"
+        cases = {
+            "/news/\n  item": "http://site.com/news/  item",
+            "/a/b/..": "http://site.com/a/",
+            "/a/./b#top": "http://site.com/a/b",
+            "/a?": "http://site.com/a",
+            "b/../c": "http://site.com/x/c",
+            "http://site.com/a/b/../c?q=1#f": "http://site.com/a/c?q=1",
+            "http://site.com/a\t/b\n": "http://site.com/a/b",
+        }
+        for href, expected in cases.items():
+            self.assertEqual(extractor.normalize(base, href), expected, href)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,326 @@
+"""Сховища відвіданих сторінок для обходу: точне, компактне (відбитки) та дискове"""
+
+import hashlib
+import os
+import sqlite3
+from array import array
+
+VISITED_STORES = ("exact", "fingerprint", "disk")
+DUMP_CHUNK = 65536
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    Повертає 64-бітний відбиток URL (BLAKE2b).
+
+    Замість повного рядка у множині відвіданих сторінок і в контрольній
+    точці зберігається лише 8-байтове число.
+
+    :param url: str, URL сторінки.
+    :return: int, відбиток URL.
+    """
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(),
+                          "little")
+
+
+class ExactVisitedStore:
+    """
+    Множина повних URL у пам'яті: без хибних збігів, але найбільша за обсягом.
+
+    Спільний інтерфейс сховищ: add(url) -> bool (True, якщо URL новий),
+    url in store, len(store), clear(), dump(file) / load(file) для
+    контрольних точок та close().
+    """
+
+    kind = "exact"
+
+    def __init__(self):
+        self._urls = set()
+
+    def add(self, url: str) -> bool:
+        """
+        Додає URL до відвіданих.
+
+        :param url: str, URL сторінки.
+        :return: bool, True, якщо URL ще не було у сховищі.
+        """
+        if url in self._urls:
+            return False
+        self._urls.add(url)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def clear(self):
+        """Видаляє всі URL зі сховища."""
+        self._urls.clear()
+
+    def dump(self, file):
+        """
+        Записує вміст сховища у відкритий бінарний файл (URL по рядку).
+
+        :param file: бінарний файл для запису.
+        """
+        for url in self._urls:
+            file.write(url.encode("utf-8") + b"\n")
+
+    def load(self, file):
+        """
+        Замінює вміст сховища даними, записаними dump.
+
+        :param file: бінарний файл для читання.
+        """
+        self._urls = {line.decode("utf-8") for line in file.read().splitlines()}
+
+    def close(self):
+        """Звільняє ресурси сховища (для сховища в пам'яті нічого не робить)."""
+
+
+class FingerprintVisitedStore:
+    """
+    Компактна множина 64-бітних відбитків URL у пам'яті.
+
+    Відбитки лежать у хеш-таблиці з відкритою адресацією на основі
+    array('Q') – 8 байтів на комірку, заповнену не більше ніж на
+    MAX_LOAD, тобто близько 11–22 байтів на URL замість ~100 байтів у
+    set рядків. Нуль позначає порожню комірку, тому нульовий відбиток
+    замінюється на 1. Два різні URL з однаковим відбитком вважаються
+    однією сторінкою; для 64-бітного хешу це практично неможливо
+    (~N² / 2⁶⁵ збігів на N сторінок).
+    """
+
+    kind = "fingerprint"
+    MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024):
+        self._reset(capacity)
+
+    def _reset(self, capacity: int):
+        """
+        Створює порожню таблицю щонайменше на capacity комірок (степінь двійки).
+
+        :param capacity: int, мінімальна кількість комірок.
+        """
+        self._size = 0
+        self._table = array('Q', bytes(8 * max(8, 1 << (capacity - 1).bit_length())))
+        self._mask = len(self._table) - 1
+
+    def _insert(self, fingerprint: int) -> bool:
+        """
+        Вставляє відбиток у таблицю (лінійне зондування).
+
+        :param fingerprint: int, ненульовий відбиток.
+        :return: bool, True, якщо відбитка ще не було.
+        """
+        table = self._table
+        mask = self._mask
+        slot = (fingerprint ^ (fingerprint >> 32)) & mask
+        while True:
+            value = table[slot]
+            if value == fingerprint:
+                return False
+            if not value:
+                table[slot] = fingerprint
+                self._size += 1
+                if self._size > self.MAX_LOAD * len(table):
+                    self._grow()
+                return True
+            slot = (slot + 1) & mask
+
+    def _grow(self):
+        """Подвоює таблицю і перевставляє всі відбитки."""
+        old = self._table
+        table = self._table = array('Q', bytes(16 * len(old)))
+        mask = self._mask = len(table) - 1
+        for value in old:
+            if value:
+                slot = (value ^ (value >> 32)) & mask
+                while table[slot]:
+                    slot = (slot + 1) & mask
+                table[slot] = value
+
+    def add(self, url: str) -> bool:
+        """
+        Додає URL до відвіданих.
+
+        :param url: str, URL сторінки.
+        :return: bool, True, якщо URL (його відбитка) ще не було у сховищі.
+        """
+        return self._insert(url_fingerprint(url) or 1)
+
+    def __contains__(self, url: str) -> bool:
+        fingerprint = url_fingerprint(url) or 1
+        table = self._table
+        slot = (fingerprint ^ (fingerprint >> 32)) & self._mask
+        while table[slot]:
+            if table[slot] == fingerprint:
+                return True
+            slot = (slot + 1) & self._mask
+        return False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Видаляє всі відбитки зі сховища."""
+        self._reset(1024)
+
+    def dump(self, file):
+        """
+        Записує відбитки у відкритий бінарний файл (8 байтів на відбиток).
+
+        :param file: бінарний файл для запису.
+        """
+        array('Q', (value for value in self._table if value)).tofile(file)
+
+    def load(self, file):
+        """
+        Замінює вміст сховища відбитками, записаними dump.
+
+        :param file: бінарний файл для читання.
+        """
+        fingerprints = array('Q')
+        fingerprints.frombytes(file.read())
+        self._reset(int(len(fingerprints) / self.MAX_LOAD) + 1)
+        for value in fingerprints:
+            self._insert(value)
+
+    def close(self):
+        """Звільняє ресурси сховища (для сховища в пам'яті нічого не робить)."""
+
+
+class DiskVisitedStore:
+    """
+    Відбитки URL у файлі SQLite – для обходів, що не вміщуються в пам'ять.
+
+    Відбиток зберігається як INTEGER PRIMARY KEY (ключ B-дерева таблиці),
+    тож у пам'яті лишається лише кеш сторінок SQLite. Зміни фіксуються
+    пакетами по commit_every вставок; журнал WAL і synchronous=OFF
+    прибирають fsync з кожної транзакції – після збою сховище однаково
+    відновлюється з контрольної точки. Кількість відбитків ведеться
+    в пам'яті, тож len() не сканує таблицю.
+    """
+
+    kind = "disk"
+
+    def __init__(self, path: str, commit_every: int = 10_000, cache_kib: int = 16_384):
+        self.path = path
+        self.commit_every = commit_every
+        self._pending = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute(f"PRAGMA cache_size = -{cache_kib}")
+        self._db.execute("CREATE TABLE IF NOT EXISTS visited (fp INTEGER PRIMARY KEY)")
+        self._db.commit()
+        self._count = self._db.execute("SELECT COUNT(*) FROM visited").fetchone()[0]
+
+    @staticmethod
+    def _key(url: str) -> int:
+        """
+        Переводить відбиток URL у знакове 64-бітне число (тип INTEGER у SQLite).
+
+        :param url: str, URL сторінки.
+        :return: int, ключ для таблиці visited.
+        """
+        fingerprint = url_fingerprint(url)
+        return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+    def add(self, url: str) -> bool:
+        """
+        Додає URL до відвіданих.
+
+        :param url: str, URL сторінки.
+        :return: bool, True, якщо URL (його відбитка) ще не було у сховищі.
+        """
+        cursor = self._db.execute("INSERT OR IGNORE INTO visited VALUES (?)", (self._key(url),))
+        if not cursor.rowcount:
+            return False
+        self._count += 1
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._db.commit()
+            self._pending = 0
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return self._db.execute("SELECT 1 FROM visited WHERE fp = ?",
+                                (self._key(url),)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        """Видаляє всі відбитки зі сховища."""
+        self._db.execute("DELETE FROM visited")
+        self._db.commit()
+        self._pending = 0
+        self._count = 0
+
+    def dump(self, file):
+        """
+        Записує відбитки у відкритий бінарний файл частинами по DUMP_CHUNK.
+
+        Формат той самий, що й у FingerprintVisitedStore.dump.
+
+        :param file: бінарний файл для запису.
+        """
+        cursor = self._db.execute("SELECT fp FROM visited")
+        while rows := cursor.fetchmany(DUMP_CHUNK):
+            array('q', (row[0] for row in rows)).tofile(file)
+
+    def load(self, file):
+        """
+        Замінює вміст сховища відбитками, записаними dump.
+
+        :param file: бінарний файл для читання.
+        """
+        self._db.execute("DELETE FROM visited")
+        while chunk := file.read(8 * DUMP_CHUNK):
+            keys = array('q')
+            keys.frombytes(chunk)
+            self._db.executemany("INSERT OR IGNORE INTO visited VALUES (?)",
+                                 ((key,) for key in keys))
+        self._db.commit()
+        self._pending = 0
+        self._count = self._db.execute("SELECT COUNT(*) FROM visited").fetchone()[0]
+
+    def close(self):
+        """Фіксує зміни та закриває файл SQLite."""
+        self._db.commit()
+        self._db.close()
+
+
+def make_visited_store(kind: str = "fingerprint", path: str | None = None):
+    """
+    Створює сховище відвіданих сторінок за назвою.
+
+    :param kind: str, назва з VISITED_STORES.
+    :param path: str | None, файл SQLite для "disk".
+    :return: сховище відвіданих сторінок.
+    :raises ValueError: якщо назва невідома або для "disk" не задано path.
+    """
+    if kind == "exact":
+        return ExactVisitedStore()
+    if kind == "fingerprint":
+        return FingerprintVisitedStore()
+    if kind == "disk":
+        if path is None:
+            raise ValueError("Для дискового сховища потрібен шлях до файлу.")
+        return DiskVisitedStore(path)
+    raise ValueError(f"Невідоме сховище відвіданих сторінок: {kind}")
+
+
+def remove_visited_store(path: str):
+    """
+    Видаляє файл дискового сховища разом зі службовими файлами WAL.
+
+    :param path: str, файл SQLite.
+    """
+    for name in (path, path + "-wal", path + "-shm"):
+        if os.path.exists(name):
+            os.remove(name)